@@ -1,32 +1,145 @@
 import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import List, Dict, Any
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, BaseMessage
 from langchain_community.tools import TavilySearchResults
 
-tavily_search = TavilySearchResults(max_results=5)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.search_cache import cached_search_tool
+from schema import ReflexionState
 
+# Draft and revisor rounds often repeat queries, so answer those from the cache
+tavily_search = cached_search_tool(TavilySearchResults(max_results=5))
 
-def execute_tools(state: List[BaseMessage]) -> List[BaseMessage]:
-    last_ai_message = state[-1]
+# Settings
+MAX_CONCURRENT_SEARCHES = 6  # Maximum number of search queries in flight at once
+SEARCH_TIMEOUT = 15  # Seconds to wait for a single search query
+
+# Shared pool so hung queries never block the graph on executor shutdown
+search_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_SEARCHES, thread_name_prefix="tavily_search"
+)
+
+
+def run_search(query: str) -> Any:
+    try:
+        return tavily_search.invoke(query)
+    except Exception as e:
+        return f"Search failed: {str(e)}"
+
+
+def run_searches(queries: List[str]) -> Dict[str, Any]:
+    """Run every query concurrently and return the results keyed by query.
+
+    Each query gets SEARCH_TIMEOUT seconds from the moment a worker picks it
+    up. A query in wave n (MAX_CONCURRENT_SEARCHES per wave) that has not
+    started within n * SEARCH_TIMEOUT of submission is stuck behind hung
+    searches. Expired queries are cancelled (a running search cannot be
+    interrupted, its result is just ignored) and reported as timed out, while
+    the others keep their own deadlines.
+    """
+    unique_queries = list(dict.fromkeys(queries))
+    if not unique_queries:
+        return {}
+
+    submitted = time.monotonic()
+    started: Dict[str, float] = {}
+
+    def timed_search(query: str) -> Any:
+        started[query] = time.monotonic()
+        return run_search(query)
+
+    def deadline(query: str) -> float:
+        if query in started:
+            return started[query] + SEARCH_TIMEOUT
+        return submitted + SEARCH_TIMEOUT * (waves[query] + 1)
+
+    waves = {query: i // MAX_CONCURRENT_SEARCHES for i, query in enumerate(unique_queries)}
+
+    pending = {query: search_executor.submit(timed_search, query) for query in unique_queries}
+    results = {}
+    while pending:
+        wait(
+            pending.values(),
+            timeout=max(0.0, min(map(deadline, pending)) - time.monotonic()),
+            return_when=FIRST_COMPLETED,
+        )
+        now = time.monotonic()
+        for query, future in list(pending.items()):
+            if future.done():
+                results[query] = future.result()
+            elif now >= deadline(query):
+                if not future.cancel() and now < deadline(query):
+                    continue  # Started just now, so its own deadline applies
+                results[query] = f"Search timed out after {SEARCH_TIMEOUT} seconds"
+            else:
+                continue
+            del pending[query]
+
+    return {query: results[query] for query in unique_queries}
+
+
+def execute_tools(state: ReflexionState) -> dict:
+    last_ai_message = state["messages"][-1]
 
     if not hasattr(last_ai_message, "tool_calls") or not last_ai_message.tool_calls:
-        return []
+        return {}
+
+    tool_calls = [
+        tool_call
+        for tool_call in last_ai_message.tool_calls
+        if tool_call["name"] in ["AnswerQuestion", "ReviseAnswer"]
+    ]
+
+    # Fan out all queries from all tool calls at once, so one round costs as
+    # much as the slowest query instead of the sum of all of them
+    all_queries = []
+    for tool_call in tool_calls:
+        all_queries.extend(tool_call["args"].get("search_queries", []))
+
+    search_results = run_searches(all_queries)
 
     tool_messages = []
+    latest_results = {}
 
-    for tool_call in last_ai_message.tool_calls:
-        if tool_call["name"] in ["AnswerQuestion", "ReviseAnswer"]:
-            call_id = tool_call["id"]
-            search_query = tool_call["args"].get("search_queries", [])
+    for tool_call in tool_calls:
+        call_id = tool_call["id"]
+        search_query = tool_call["args"].get("search_queries", [])
 
-            query_results = {}
+        query_results = {}
 
-            for query in search_query:
-                result = tavily_search.invoke(query)
-                query_results[query] = result
+        for query in search_query:
+            query_results[query] = search_results[query]
 
-            tool_messages.append(
-                ToolMessage(content=json.dumps(query_results), tool_call_id=call_id)
+        # The message history only keeps a short stub; the payload lives in
+        # search_results and is inlined for the revisor by with_latest_evidence
+        latest_results[call_id] = query_results
+        tool_messages.append(
+            ToolMessage(
+                content=f"Search results for: {'; '.join(search_query)}",
+                tool_call_id=call_id,
             )
+        )
+
+    return {
+        "messages": tool_messages,
+        "iterations": state.get("iterations", 0) + 1,
+        "search_results": latest_results,
+    }
 
-    return tool_messages
+
+def with_latest_evidence(state: ReflexionState) -> List[BaseMessage]:
+    """Return the messages with only the latest search payloads inlined"""
+    search_results = state.get("search_results") or {}
+    messages = []
+    for message in state["messages"]:
+        if isinstance(message, ToolMessage) and message.tool_call_id in search_results:
+            message = ToolMessage(
+                content=json.dumps(search_results[message.tool_call_id]),
+                tool_call_id=message.tool_call_id,
+            )
+        messages.append(message)
+    return messages
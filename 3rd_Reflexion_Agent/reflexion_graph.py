@@ -1,26 +1,35 @@
-from typing import List
-
-from langchain_core.messages import BaseMessage, ToolMessage, HumanMessage
-from langgraph.graph import END, MessageGraph
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END, StateGraph
 
 from chains import revisor_chain, first_responder_chain
-from execute_tools import execute_tools
+from execute_tools import execute_tools, with_latest_evidence
+from schema import ReflexionState
 
-graph = MessageGraph()
+graph = StateGraph(ReflexionState)
 MAX_ITERATIONS = 2
 
-graph.add_node("draft", first_responder_chain)
+
+def draft_node(state: ReflexionState):
+    return {"messages": [first_responder_chain.invoke({"messages": state["messages"]})]}
+
+
+def revisor_node(state: ReflexionState):
+    # Older rounds only keep their stubs, so the prompt carries the latest evidence
+    messages = with_latest_evidence(state)
+    return {"messages": [revisor_chain.invoke({"messages": messages})]}
+
+
+graph.add_node("draft", draft_node)
 graph.add_node("execute_tools", execute_tools)
-graph.add_node("revisor", revisor_chain)
+graph.add_node("revisor", revisor_node)
 
 
 graph.add_edge("draft", "execute_tools")
 graph.add_edge("execute_tools", "revisor")
 
 
-def event_loop(state: List[BaseMessage]) -> str:
-    count_tool_visits = sum(isinstance(item, ToolMessage) for item in state)
-    num_iterations = count_tool_visits
+def event_loop(state: ReflexionState) -> str:
+    num_iterations = state["iterations"]
     if num_iterations > MAX_ITERATIONS:
         return "end"
     return "execute_tools"
@@ -36,9 +45,12 @@ app = graph.compile()
 print(app.get_graph().draw_mermaid())
 print(app.get_graph().draw_ascii())
 
-# Properly format the input as a list of messages
-input_messages = [HumanMessage(content="Write about how small business can leverage AI to grow")]
-response = app.invoke(input_messages)
+initial_state = {
+    "messages": [HumanMessage(content="Write about how small business can leverage AI to grow")],
+    "iterations": 0,
+    "search_results": {},
+}
+response = app.invoke(initial_state)
 
-print(response[-1].tool_calls[0]["args"]["answer"])
+print(response["messages"][-1].tool_calls[0]["args"]["answer"])
 print(response, "response")
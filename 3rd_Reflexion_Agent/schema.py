@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, Annotated, Dict, List, TypedDict
+from langchain_core.messages import BaseMessage
+from langgraph.graph import add_messages
 
 
 class Reflection(BaseModel):
@@ -23,3 +25,11 @@ class ReviseAnswer(AnswerQuestion):
     references: List[str] = Field(
         description="Citations motivating your updated answers."
     )
+
+
+class ReflexionState(TypedDict):
+    messages: Annotated[List[BaseMessage], add_messages]
+    # Number of completed execute_tools rounds, so routing never rescans messages
+    iterations: int
+    # Latest round of search payloads keyed by tool_call_id, then by query
+    search_results: Dict[str, Dict[str, Any]]
@@ -1,16 +1,20 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_anthropic import ChatAnthropic
-from langchain.agents import create_react_agent, tool
+from langchain.agents import create_react_agent, create_tool_calling_agent, tool
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import datetime
 from langchain_community.tools import TavilySearchResults
-from langchain import hub
 from dotenv import load_dotenv
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.resources import get_chat_model, get_react_prompt
+from common.search_cache import cached_search_tool
 
 load_dotenv()
 
-# llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
-llm = ChatAnthropic(model="claude-3-5-sonnet-20240620")
-search_tool = TavilySearchResults(search_depth="basic")
+# llm = get_chat_model("google", "gemini-1.5-flash")
+llm = get_chat_model("anthropic", "claude-3-5-sonnet-20240620")
+search_tool = cached_search_tool(TavilySearchResults(search_depth="basic"))
 
 
 @tool
@@ -21,5 +25,29 @@ def get_system_time(format: str = "%Y-%m-%d %H:%M:%S"):
 
 tools = [search_tool, get_system_time]
 
-react_prompt = hub.pull("hwchase17/react")
-react_agent_runnable = create_react_agent(tools=tools, llm=llm, prompt=react_prompt)
+# Built once so act_node can look tools up by name instead of scanning the list
+tools_by_name = {tool.name: tool for tool in tools}
+
+# When enabled the reason step may request several independent tool calls at
+# once, and act_node runs them in parallel
+PARALLEL_ACTIONS = True
+
+if PARALLEL_ACTIONS:
+    tool_calling_prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                "You are a helpful assistant. When answering needs several independent "
+                "lookups, request all of those tool calls in a single step.",
+            ),
+            ("human", "{input}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ]
+    )
+    react_agent_runnable = create_tool_calling_agent(
+        tools=tools, llm=llm, prompt=tool_calling_prompt
+    )
+else:
+    # Vendored copy of hwchase17/react, so no hub round-trip at import
+    react_prompt = get_react_prompt()
+    react_agent_runnable = create_react_agent(tools=tools, llm=llm, prompt=react_prompt)
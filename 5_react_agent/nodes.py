@@ -1,61 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from langgraph.prebuilt.tool_executor import ToolExecutor
 from langgraph.graph import END, StateGraph
+from langchain_core.agents import AgentAction
 
-from agent_reason_runnable import react_agent_runnable, tools
-from react_state import AgentState
+from agent_reason_runnable import react_agent_runnable, tools_by_name
+from react_state import AgentState, ReplaceSteps
+from scratchpad import compact_steps
 
 
 load_dotenv()
 
+MAX_PARALLEL_ACTIONS = 4  # Maximum number of tool calls run at once by act_node
+
+action_executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_ACTIONS)
+
 
 def reason_node(state: AgentState):
     agent_outcome = react_agent_runnable.invoke(state)
     return {"agent_outcome": agent_outcome}
 
 
-def act_node(state: AgentState):
-    agent_action = state["agent_outcome"]
-
+def run_action(agent_action: AgentAction) -> str:
     tool_name = agent_action.tool
     tool_input = agent_action.tool_input
 
-    tool_function = None
-    for tool in tools:
-        if tool.name == tool_name:
-            tool_function = tool
-            break
+    tool_function = tools_by_name.get(tool_name)
 
     if tool_function:
-        if isinstance(tool_input, dict):
-            output = tool_function.invoke(**tool_input)
-        else:
-            output = tool_function.invoke(tool_input)
+        output = tool_function.invoke(tool_input)
     else:
         output = f"Tool {tool_name} not found"
-    return {"intermediate_steps": [(agent_action, str(output))]}
+    return str(output)
 
 
-def filter_memory_node(state: AgentState):
-    """Limit memory by keeping only the last 8 messages in intermediate_steps."""
-    if len(state["intermediate_steps"]) > 8:
-        state["intermediate_steps"] = state["intermediate_steps"][-8:]
-    return {"intermediate_steps": state["intermediate_steps"]}
+def act_node(state: AgentState):
+    agent_outcome = state["agent_outcome"]
+
+    # A tool calling agent returns a list of independent actions per step
+    if isinstance(agent_outcome, list):
+        agent_actions = agent_outcome
+    else:
+        agent_actions = [agent_outcome]
+
+    if len(agent_actions) == 1:
+        outputs = [run_action(agent_actions[0])]
+    else:
+        outputs = list(action_executor.map(run_action, agent_actions))
+
+    # All results land in intermediate_steps in one reducer update, in the
+    # order the agent requested them
+    return {"intermediate_steps": list(zip(agent_actions, outputs))}
+
+
+def compact_memory_node(state: AgentState):
+    """Keep the scratchpad within SCRATCHPAD_TOKEN_BUDGET.
+
+    See scratchpad.compact_steps: older observations are truncated, then the
+    oldest LLM turns dropped whole, until the budget holds. The compacted list replaces
+    the stored steps, so the prompt stops growing with every tool call.
+    """
+    steps, tokens_saved = compact_steps(state["intermediate_steps"])
+    if tokens_saved <= 0:
+        return {}
+
+    return {
+        "intermediate_steps": ReplaceSteps(steps),
+        "tokens_saved": tokens_saved,
+    }
 
 
 def should_continue(state: AgentState):
     """Check if we should continue or end the agent loop."""
-    # If the agent outcome is None, we're just starting
-    if state["agent_outcome"] is None:
-        return "reason"
-    
     # If the agent output is AgentFinish, we're done
     from langchain_core.agents import AgentFinish
     if isinstance(state["agent_outcome"], AgentFinish):
         return END
     
     # Otherwise, we continue with the loop
-    return "reason"
+    return "act"
 
 
 # Create the agent graph
@@ -65,12 +88,12 @@ def build_agent_graph():
     # Add nodes
     workflow.add_node("reason", reason_node)
     workflow.add_node("act", act_node)
-    workflow.add_node("filter_memory", filter_memory_node)
+    workflow.add_node("compact_memory", compact_memory_node)
     
     # Build graph edges
-    workflow.add_edge("reason", "act")
-    workflow.add_edge("act", "filter_memory")
-    workflow.add_edge("filter_memory", should_continue)
+    workflow.add_conditional_edges("reason", should_continue)
+    workflow.add_edge("act", "compact_memory")
+    workflow.add_edge("compact_memory", "reason")
     
     # Set entry point
     workflow.set_entry_point("reason")
@@ -5,11 +5,12 @@ load_dotenv()
 from langchain_core.agents import AgentFinish, AgentAction
 from langgraph.graph import END, StateGraph
 
-from nodes import reason_node, act_node
+from nodes import reason_node, act_node, compact_memory_node
 from react_state import AgentState
 
 REASON_NODE = "reason_node"
 ACT_NODE = "act_node"
+COMPACT_NODE = "compact_memory_node"
 
 
 def should_continue(state: AgentState) -> str:
@@ -23,6 +24,7 @@ graph = StateGraph(AgentState)
 
 graph.add_node(REASON_NODE, reason_node)
 graph.add_node(ACT_NODE, act_node)
+graph.add_node(COMPACT_NODE, compact_memory_node)
 
 graph.set_entry_point(REASON_NODE)
 graph.add_conditional_edges(
@@ -30,7 +32,8 @@ graph.add_conditional_edges(
     should_continue,
 )
 
-graph.add_edge(ACT_NODE, REASON_NODE)
+graph.add_edge(ACT_NODE, COMPACT_NODE)
+graph.add_edge(COMPACT_NODE, REASON_NODE)
 
 app = graph.compile()
 
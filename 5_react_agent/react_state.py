@@ -1,11 +1,24 @@
 import operator
-from typing import Union, Annotated, TypedDict
+from typing import Union, Annotated, List, TypedDict
 
 from langchain_core.agents import AgentAction, AgentFinish
 
 
+class ReplaceSteps(list):
+    """Marks an intermediate_steps update that replaces the list instead of extending it"""
+
+
+def update_steps(
+    existing: list[tuple[AgentAction, str]], new: list[tuple[AgentAction, str]]
+) -> list[tuple[AgentAction, str]]:
+    if isinstance(new, ReplaceSteps):
+        return list(new)
+    return existing + new
+
+
 class AgentState(TypedDict):
     input: str
-    agent_outcome: Union[AgentAction, AgentFinish, None]
-    intermediate_steps: Annotated[list[tuple[AgentAction, str]], operator.add]
-
+    agent_outcome: Union[AgentAction, List[AgentAction], AgentFinish, None]
+    intermediate_steps: Annotated[list[tuple[AgentAction, str]], update_steps]
+    # Running total of scratchpad tokens removed by compact_memory_node
+    tokens_saved: Annotated[int, operator.add]
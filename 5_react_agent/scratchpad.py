@@ -0,0 +1,70 @@
+from langchain_core.agents import AgentAction
+
+# Scratchpad compaction settings
+SCRATCHPAD_TOKEN_BUDGET = 2000  # Observations are compacted until they fit in this many tokens
+KEEP_LAST_TURNS = 3  # Steps of the most recent LLM turns are always kept verbatim
+MAX_OLD_OBSERVATION_TOKENS = 100  # Older observations are truncated to this size
+
+Step = tuple[AgentAction, str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for budgeting the scratchpad"""
+    return len(text) // 4
+
+
+def scratchpad_tokens(steps: list[Step]) -> int:
+    return sum(estimate_tokens(observation) for _, observation in steps)
+
+
+def group_turns(steps: list[Step]) -> list[list[Step]]:
+    """Split steps into LLM turns.
+
+    With parallel tool calls, one turn yields several actions that share the
+    message_log holding the AIMessage and its tool_calls. Every one of those
+    calls needs its observation in the scratchpad, or the provider rejects the
+    AIMessage, so a turn is only ever kept or dropped whole. Actions without a
+    message_log (ReAct text parsing) are one turn each.
+    """
+    turns: list[list[Step]] = []
+    previous_log = None
+    for action, observation in steps:
+        message_log = getattr(action, "message_log", None)
+        if turns and message_log and message_log == previous_log:
+            turns[-1].append((action, observation))
+        else:
+            turns.append([(action, observation)])
+        previous_log = message_log
+    return turns
+
+
+def compact_steps(steps: list[Step]) -> tuple[list[Step], int]:
+    """Compacted steps and the tokens saved.
+
+    Observations outside the last KEEP_LAST_TURNS turns are truncated to
+    MAX_OLD_OBSERVATION_TOKENS first; if that is not enough, the oldest turns
+    are dropped whole until the scratchpad fits SCRATCHPAD_TOKEN_BUDGET. The
+    last KEEP_LAST_TURNS turns are never touched, so they alone may still
+    exceed the budget.
+    """
+    total_tokens = scratchpad_tokens(steps)
+    turns = group_turns(steps)
+    if total_tokens <= SCRATCHPAD_TOKEN_BUDGET or len(turns) <= KEEP_LAST_TURNS:
+        return steps, 0
+
+    max_chars = MAX_OLD_OBSERVATION_TOKENS * 4
+    old_turns = []
+    for turn in turns[:-KEEP_LAST_TURNS]:
+        compacted_turn = []
+        for action, observation in turn:
+            if len(observation) > max_chars:
+                observation = observation[:max_chars] + " ...[truncated]"
+            compacted_turn.append((action, observation))
+        old_turns.append(compacted_turn)
+    recent_steps = [step for turn in turns[-KEEP_LAST_TURNS:] for step in turn]
+
+    compacted_tokens = sum(map(scratchpad_tokens, old_turns)) + scratchpad_tokens(recent_steps)
+    while old_turns and compacted_tokens > SCRATCHPAD_TOKEN_BUDGET:
+        compacted_tokens -= scratchpad_tokens(old_turns.pop(0))
+
+    return [step for turn in old_turns for step in turn] + recent_steps, total_tokens - compacted_tokens
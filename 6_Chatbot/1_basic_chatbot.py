@@ -3,6 +3,12 @@ from langgraph.graph import END, add_messages, StateGraph
 from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage, HumanMessage
 from dotenv import load_dotenv
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver, chat_loop
 
 load_dotenv()
 
@@ -13,8 +19,8 @@ class BasicChatState(TypedDict):
     messages: Annotated[list, add_messages]
 
 
-def chatbot(state: BasicChatState):
-    return {"messages": [llm.invoke(state["messages"])]}
+async def chatbot(state: BasicChatState):
+    return {"messages": [await llm.ainvoke(state["messages"])]}
 
 
 graph = StateGraph(BasicChatState)
@@ -24,10 +30,4 @@ graph.add_edge("chatbot", END)
 
 app = graph.compile()
 
-while True:
-    user_input = input("User : ")
-    if user_input.lower() == "exit":
-        break
-    else:
-        result = app.invoke({"messages": [HumanMessage(content=user_input)]})
-        print(result["messages"][-1].content)
+asyncio.run(chat_loop(ConversationDriver(app)))
@@ -5,6 +5,13 @@ from langchain_core.messages import AIMessage, HumanMessage
 from dotenv import load_dotenv
 from langchain_community.tools import TavilySearchResults
 from langgraph.prebuilt import ToolNode
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver, chat_loop
+from common.search_cache import cached_search_tool
 
 load_dotenv()
 
@@ -14,15 +21,15 @@ class BasicChatState(TypedDict):
 
 
 llm = ChatGroq(model_name="llama-3.1-8b-instant")
-tool = TavilySearchResults(max_results=4)
+tool = cached_search_tool(TavilySearchResults(max_results=4))
 
 tools = [tool]
 
 llm_with_tools = llm.bind_tools(tools=tools)
 
 
-def chatbot(state: BasicChatState):
-    return {"messages": [llm_with_tools.invoke(state["messages"])]}
+async def chatbot(state: BasicChatState):
+    return {"messages": [await llm_with_tools.ainvoke(state["messages"])]}
 
 
 def tools_router(state: BasicChatState):
@@ -45,10 +52,4 @@ graph.add_edge("tool_node", "chatbot")
 
 app = graph.compile()
 
-while True:
-    user_input = input("User : ")
-    if user_input.lower() == "exit":
-        break
-    else:
-        result = app.invoke({"messages": [HumanMessage(content=user_input)]})
-        print(result["messages"][-1].content)
+asyncio.run(chat_loop(ConversationDriver(app)))
@@ -1,30 +1,43 @@
 from typing import TypedDict, Annotated
+from typing_extensions import NotRequired
 from langgraph.graph import END, add_messages, StateGraph
 from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage, HumanMessage
 from dotenv import load_dotenv
-from langgraph.checkpoint.memory import MemorySaver
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver, chat_loop
+from common.bounded_memory import BoundedMemorySaver
+from common.message_window import aupdate_summary, trim_window, with_summary
 
 load_dotenv()
 
 llm = ChatGroq(model_name="llama-3.1-8b-instant")
 
-memory = MemorySaver()
-window_size = 3
+memory = BoundedMemorySaver(max_checkpoints=5, max_threads=1_000)
+window_size = 3  # Exchanges kept in the persisted state
+summarize = True  # Fold evicted exchanges into a rolling summary (one extra LLM call per eviction)
 
 
 class BasicChatState(TypedDict):
     messages: Annotated[list, add_messages]
+    summary: NotRequired[str]
 
 
-def chatbot(state: BasicChatState):
-    # Limit the message history to window_size messages
-    if (
-        len(state["messages"]) > window_size * 2
-    ):  # *2 because each exchange has user+AI messages
-        state["messages"] = state["messages"][-window_size * 2 :]
+async def chatbot(state: BasicChatState):
+    # RemoveMessage deltas drop old exchanges from the checkpoint, not just from the prompt
+    removals, evicted, window = trim_window(state["messages"], window_size)
+    summary = state.get("summary", "")
+    update = {}
+    if summarize and evicted:
+        summary = await aupdate_summary(llm, summary, evicted)
+        update["summary"] = summary
 
-    return {"messages": [llm.invoke(state["messages"])]}
+    update["messages"] = removals + [await llm.ainvoke(with_summary(summary, window))]
+    return update
 
 
 graph = StateGraph(BasicChatState)
@@ -34,14 +47,4 @@ graph.add_edge("chatbot", END)
 
 app = graph.compile(checkpointer=memory)
 
-config = {"configurable": {"thread_id": 1}}
-
-while True:
-    user_input = input("User : ")
-    if user_input.lower() == "exit":
-        break
-    else:
-        result = app.invoke(
-            {"messages": [HumanMessage(content=user_input)]}, config=config
-        )
-        print(result["messages"][-1].content)
+asyncio.run(chat_loop(ConversationDriver(app), thread_id="1"))
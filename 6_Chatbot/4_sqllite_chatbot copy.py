@@ -1,33 +1,43 @@
 from typing import TypedDict, Annotated
+from typing_extensions import NotRequired
 from langgraph.graph import END, add_messages, StateGraph
 from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage, HumanMessage
 from dotenv import load_dotenv
-from langgraph.checkpoint.sqlite import SqliteSaver
-import sqlite3
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver, chat_loop
+from common.compact_serde import BlobStore, CompactSerializer
+from common.message_window import aupdate_summary, trim_window, with_summary
+from common.sqlite_checkpointer import DeltaSqliteSaver
 
 load_dotenv()
 
 llm = ChatGroq(model_name="llama-3.1-8b-instant")
 
-sqlite_conn = sqlite3.connect("checkpoint.sqlite", check_same_thread=False)
-
-memory = SqliteSaver(sqlite_conn)
-window_size = 3
+window_size = 3  # Exchanges kept in the persisted state
+summarize = True  # Fold evicted exchanges into a rolling summary (one extra LLM call per eviction)
 
 
 class BasicChatState(TypedDict):
     messages: Annotated[list, add_messages]
+    summary: NotRequired[str]
 
 
-def chatbot(state: BasicChatState):
-    # Limit the message history to window_size messages
-    if (
-        len(state["messages"]) > window_size * 2
-    ):  # *2 because each exchange has user+AI messages
-        state["messages"] = state["messages"][-window_size * 2 :]
+async def chatbot(state: BasicChatState):
+    # RemoveMessage deltas drop old exchanges from the checkpoint, not just from the prompt
+    removals, evicted, window = trim_window(state["messages"], window_size)
+    summary = state.get("summary", "")
+    update = {}
+    if summarize and evicted:
+        summary = await aupdate_summary(llm, summary, evicted)
+        update["summary"] = summary
 
-    return {"messages": [llm.invoke(state["messages"])]}
+    update["messages"] = removals + [await llm.ainvoke(with_summary(summary, window))]
+    return update
 
 
 graph = StateGraph(BasicChatState)
@@ -35,16 +45,15 @@ graph.add_node("chatbot", chatbot)
 graph.set_entry_point("chatbot")
 graph.add_edge("chatbot", END)
 
-app = graph.compile(checkpointer=memory)
 
-config = {"configurable": {"thread_id": 1}}
+async def main():
+    # WAL + group commit, and appended messages are stored as deltas. Uses
+    # its own file: the schema differs from the stock SqliteSaver's checkpoint.sqlite.
+    # CompactSerializer keeps repeated long strings once, in a table of the same file
+    serde = CompactSerializer(BlobStore("delta_checkpoint.sqlite"))
+    with DeltaSqliteSaver.from_conn_string("delta_checkpoint.sqlite", serde=serde) as memory:
+        app = graph.compile(checkpointer=memory)
+        await chat_loop(ConversationDriver(app), thread_id="1")
+
 
-while True:
-    user_input = input("User : ")
-    if user_input.lower() == "exit":
-        break
-    else:
-        result = app.invoke(
-            {"messages": [HumanMessage(content=user_input)]}, config=config
-        )
-        print(result["messages"][-1].content)
+asyncio.run(main())
@@ -1,15 +1,19 @@
 from typing import List, TypedDict, Annotated
-from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from dotenv import load_dotenv
 import os
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
+import sys
+import asyncio
 import uuid
 import time
-import chromadb
 import warnings
 from langgraph.graph import END, StateGraph, add_messages
+from langchain_core.runnables import RunnableConfig
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver
+from common.history_index import DEFAULT_THREAD, HistoryIndex
+from common.resources import get_chat_model, get_chroma_client, get_embeddings, lazy_resource
 
 # Suppress deprecation warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -21,30 +25,63 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 persistent_dir = os.path.join(current_dir, "db", "chroma_db")
 os.makedirs(persistent_dir, exist_ok=True)
 
-llm = ChatGroq(model_name="llama-3.1-8b-instant")
+# Settings
+MAX_CHAT_HISTORY = 2  # Maximum number of chat exchanges to store
 
-embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
 
-# Initialize ChromaDB with direct client
-client = chromadb.PersistentClient(path=persistent_dir)
-# Create or get collection
-try:
-    collection = client.get_or_create_collection("chat_history")
-except:
-    # If collection exists but is corrupted, recreate it
+# The embedding model, Chroma client and LLM are built on first use and shared
+# process-wide, so importing this module stays cheap
+@lazy_resource
+def get_db():
+    # Initialize ChromaDB with direct client
+    client = get_chroma_client(persistent_dir)
+    # Create or get collection
     try:
-        client.delete_collection("chat_history")
+        client.get_or_create_collection("chat_history")
     except:
-        pass
-    collection = client.create_collection("chat_history")
+        # If collection exists but is corrupted, recreate it
+        try:
+            client.delete_collection("chat_history")
+        except:
+            pass
+        client.create_collection("chat_history")
 
-# Initialize LangChain's Chroma wrapper
-db = Chroma(
-    client=client, collection_name="chat_history", embedding_function=embeddings
-)
+    # Initialize LangChain's Chroma wrapper; vectors are cached by content so
+    # the user message is embedded once per turn
+    from langchain_chroma import Chroma
+
+    embeddings = get_embeddings(
+        persist_path=os.path.join(current_dir, "db", "embedding_cache")
+    )
+    return Chroma(
+        client=client, collection_name="chat_history", embedding_function=embeddings
+    )
 
-# Settings
-MAX_CHAT_HISTORY = 2  # Maximum number of chat exchanges to store
+
+@lazy_resource
+def get_history():
+    # Message order lives in a SQLite sidecar so trimming never scans the collection
+    history = HistoryIndex(os.path.join(current_dir, "db", "history_index.sqlite"))
+
+    # One-time backfill for collections created before the sidecar existed
+    if history.count() == 0:
+        db = get_db()
+        existing = db.get(include=["metadatas"])
+        if existing["ids"]:
+            ordered = sorted(
+                zip(existing["ids"], existing["metadatas"]),
+                key=lambda x: x[1].get("timestamp", 0),
+            )
+            history.extend(
+                (doc_id, metadata.get("role", "unknown")) for doc_id, metadata in ordered
+            )
+            # Older messages had no thread key; they belong to the default thread
+            collection = get_chroma_client(persistent_dir).get_collection("chat_history")
+            collection.update(
+                ids=[doc_id for doc_id, _ in ordered],
+                metadatas=[{**metadata, "thread_id": DEFAULT_THREAD} for _, metadata in ordered],
+            )
+    return history
 
 
 # Define the state of the chatbot
@@ -54,66 +91,57 @@ class ChatState(TypedDict):
     similar_context: str
 
 
-def store_message(content, role):
-    """Store a message in ChromaDB"""
-    # Generate a unique ID
-    doc_id = str(uuid.uuid4())
+def get_thread_id(config: RunnableConfig) -> str:
+    return str(config.get("configurable", {}).get("thread_id") or DEFAULT_THREAD)
 
-    # Add to ChromaDB with timestamp
-    db.add_texts(
-        texts=[content],
-        metadatas=[{"role": role, "timestamp": time.time()}],
-        ids=[doc_id],
-    )
 
-    # Ensure we keep only the last MAX_CHAT_HISTORY exchanges
-    limit_chroma_history()
+async def store_turn(user_message, ai_message, thread_id=DEFAULT_THREAD):
+    """Store a turn's user and assistant messages in ChromaDB"""
+    # Generate unique IDs
+    user_id = str(uuid.uuid4())
+    ai_id = str(uuid.uuid4())
+    timestamp = time.time()
 
+    # Both texts go in one call, so they are embedded as one batch (the user
+    # message is already cached from the similarity search)
+    await get_db().aadd_texts(
+        texts=[user_message, ai_message],
+        metadatas=[
+            {"role": "user", "timestamp": timestamp, "thread_id": thread_id},
+            {"role": "assistant", "timestamp": timestamp, "thread_id": thread_id},
+        ],
+        ids=[user_id, ai_id],
+    )
 
-def limit_chroma_history():
-    """Ensure only the last MAX_CHAT_HISTORY exchanges are kept in ChromaDB"""
-    try:
-        results = db.get()
-    except:
-        return
-
-    if not results or not results["ids"] or len(results["ids"]) <= MAX_CHAT_HISTORY * 2:
-        return
+    await asyncio.to_thread(get_history().extend, [(user_id, "user"), (ai_id, "assistant")], thread_id)
 
-    # Sort documents by timestamp
-    documents = []
-    for i, doc_id in enumerate(results["ids"]):
-        content = results["documents"][i]
-        metadata = results["metadatas"][i]
-        timestamp = metadata.get("timestamp", 0)
-        documents.append((doc_id, timestamp))
+    # Ensure we keep only the last MAX_CHAT_HISTORY exchanges of this thread
+    await asyncio.to_thread(limit_chroma_history, thread_id)
 
-    # Sort by timestamp
-    documents.sort(key=lambda x: x[1])
 
-    # Calculate how many to remove (keeping only the most recent ones)
-    to_remove = len(documents) - (MAX_CHAT_HISTORY * 2)
-    if to_remove <= 0:
+def limit_chroma_history(thread_id=DEFAULT_THREAD):
+    """Ensure only the last MAX_CHAT_HISTORY exchanges of a thread are kept in ChromaDB"""
+    # The sidecar knows which messages are oldest, so only those are touched
+    ids_to_remove = get_history().trim(keep=MAX_CHAT_HISTORY * 2, thread_id=thread_id)
+    if not ids_to_remove:
         return
 
-    # Get IDs of oldest documents to remove
-    ids_to_remove = [doc[0] for doc in documents[:to_remove]]
-
     # Remove them from ChromaDB
-    db.delete(ids=ids_to_remove)
+    get_db().delete(ids=ids_to_remove)
 
 
-def get_context_from_similar_messages(query):
-    """Get context from similar past messages"""
-    # Use the retriever pattern
-    retriever = db.as_retriever(
+async def get_context_from_similar_messages(query, thread_id=DEFAULT_THREAD):
+    """Get context from similar past messages of the same thread"""
+    # Use the retriever pattern; the where filter keeps other threads' messages
+    # out of the search entirely
+    retriever = get_db().as_retriever(
         search_type="similarity",
-        search_kwargs={"k": 3},
+        search_kwargs={"k": 3, "filter": {"thread_id": thread_id}},
     )
 
     try:
         # Get similar messages using the new invoke method
-        similar_results = retriever.invoke(query)
+        similar_results = await retriever.ainvoke(query)
 
         # Create context from similar past conversations
         context = ""
@@ -129,22 +157,21 @@ def get_context_from_similar_messages(query):
 
 
 # LangGraph node functions
-def process_user_message(state: ChatState):
-    """Process the user message, store it, and find similar context"""
+async def process_user_message(state: ChatState, config: RunnableConfig):
+    """Process the user message and find similar context"""
     # Extract user message from messages
     user_message = state["messages"][-1].content
 
-    # Store user message in ChromaDB
-    store_message(user_message, "user")
-
     # Find similar messages for context
-    similar_context = get_context_from_similar_messages(user_message)
+    similar_context = await get_context_from_similar_messages(
+        user_message, get_thread_id(config)
+    )
 
     # Return updated state
     return {"user_message": user_message, "similar_context": similar_context}
 
 
-def generate_response(state):
+async def generate_response(state, config: RunnableConfig):
     """Generate a response based on the conversation history and context"""
     # Create augmented messages with context
     augmented_messages = state["messages"].copy()
@@ -165,10 +192,11 @@ def generate_response(state):
         )
 
     # Generate AI response
-    ai_response = llm.invoke(augmented_messages)
+    llm = get_chat_model("groq", "llama-3.1-8b-instant")
+    ai_response = await llm.ainvoke(augmented_messages)
 
-    # Store AI response in ChromaDB
-    store_message(ai_response.content, "assistant")
+    # Store the whole turn in ChromaDB
+    await store_turn(state["user_message"], ai_response.content, get_thread_id(config))
 
     # Return updated state with AI response added to messages
     return {"messages": [ai_response]}
@@ -189,43 +217,51 @@ workflow.add_edge("generate_response", END)
 # Compile the graph
 app = workflow.compile()
 
-print("Chat started. Type 'exit' to end, 'clear' to start fresh.")
-print("The system will use context from past conversations to improve responses.")
-print("---------------------------------------------------------------------")
 
-while True:
-    user_input = input("User : ")
+def build_input(user_input):
+    # Create initial state with user message
+    return {
+        "messages": [HumanMessage(content=user_input)],
+        "user_message": "",
+        "similar_context": "",
+    }
 
-    if user_input.lower() == "exit":
-        break
 
-    elif user_input.lower() == "clear":
-        # Clear the ChromaDB collection
-        try:
-            all_ids = db.get()["ids"]
-            if all_ids:
-                db.delete(ids=all_ids)
-            print("Conversation history cleared.")
-        except Exception as e:
-            print(f"Error clearing history: {str(e)}")
-
-    else:
-        try:
-            # Create initial state with user message
-            initial_state = {
-                "messages": [HumanMessage(content=user_input)],
-                "user_message": "",
-                "similar_context": "",
-            }
+driver = ConversationDriver(app, build_input=build_input)
+
+
+async def main():
+    print("Chat started. Type 'exit' to end, 'clear' to start fresh.")
+    print("The system will use context from past conversations to improve responses.")
+    print("---------------------------------------------------------------------")
+
+    while True:
+        user_input = await asyncio.to_thread(input, "User : ")
+
+        if user_input.lower() == "exit":
+            break
+
+        elif user_input.lower() == "clear":
+            # Clear the ChromaDB collection
+            try:
+                all_ids = get_history().clear(DEFAULT_THREAD)
+                if all_ids:
+                    await get_db().adelete(ids=all_ids)
+                print("Conversation history cleared.")
+            except Exception as e:
+                print(f"Error clearing history: {str(e)}")
+
+        else:
+            try:
+                # Invoke the graph and display the result
+                print(await driver.send(DEFAULT_THREAD, user_input))
 
-            # Invoke the graph
-            result = app.invoke(initial_state)
+            except Exception as e:
+                print(f"Error: {str(e)}")
+                print("Let's try again.")
 
-            # Display result
-            print(result["messages"][-1].content)
+    print("Chat ended.")
 
-        except Exception as e:
-            print(f"Error: {str(e)}")
-            print("Let's try again.")
 
-print("Chat ended.")
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,16 @@
 from typing import Annotated, TypedDict
 from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph, add_messages, END
+from langgraph.types import Command, interrupt
 from langchain_groq import ChatGroq
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.approvals import ApprovalService
+from common.bounded_memory import BoundedMemorySaver
 
 
 class State(TypedDict):
@@ -21,18 +30,15 @@ def generate_post(state: State) -> State:
 
 
 def get_review_decision(state: State):
-    post_content = state["messages"][-1].content
-
-    print("\n\nCurrent Linkedin Post \n\n")
-    print(post_content)
-    print("\n\n")
-
-    decision = input("Post to Linkedin? (yes/no)")
+    # interrupt() parks the run instead of holding the worker on input()
+    decision = interrupt(
+        {"post": state["messages"][-1].content, "message": "Post to Linkedin? (yes/no)"}
+    )
 
     if decision == "yes":
-        return POST
+        return Command(goto=POST)
     else:
-        return COLLECT_FEEDBACK
+        return Command(goto=COLLECT_FEEDBACK)
 
 
 def post(state: State):
@@ -44,7 +50,7 @@ def post(state: State):
 
 
 def collect_feedback(state: State):
-    feedback = input("How can I imporve the post?")
+    feedback = interrupt({"message": "How can I imporve the post?"})
 
     return {"messages": [HumanMessage(content=feedback)]}
 
@@ -58,18 +64,35 @@ graph.add_node(COLLECT_FEEDBACK, collect_feedback)
 
 graph.set_entry_point(GENERATE_POST)
 
-graph.add_conditional_edges(GENERATE_POST, get_review_decision)
+graph.add_edge(GENERATE_POST, GET_REVIEW_DECISION)
 graph.add_edge(POST, END)
 graph.add_edge(COLLECT_FEEDBACK, GENERATE_POST)
 
-app = graph.compile()
+app = graph.compile(checkpointer=BoundedMemorySaver())
+
+
+async def main():
+    service = ApprovalService(app)
+    response = await service.start(
+        str(uuid.uuid4()),
+        {
+            "messages": [
+                HumanMessage(content="Write a post about the benefits of using LangGraph")
+            ]
+        },
+    )
+
+    # Reviewing from the pending queue; any other worker could answer these instead
+    while pending := service.pending(limit=1):
+        approval = pending[0]
+        if "post" in approval.value:
+            print("\n\nCurrent Linkedin Post \n\n")
+            print(approval.value["post"])
+            print("\n\n")
+        answer = await asyncio.to_thread(input, approval.value["message"])
+        response = await service.resume(approval.thread_id, answer, approval.interrupt_id)
+
+    print(response.values)
 
-response = app.invoke(
-    {
-        "messages": [
-            HumanMessage(content="Write a post about the benefits of using LangGraph")
-        ]
-    }
-)
 
-print(response)
+asyncio.run(main())
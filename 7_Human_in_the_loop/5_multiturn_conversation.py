@@ -1,10 +1,16 @@
 from langgraph.graph import StateGraph, END, START, add_messages
 from langgraph.types import interrupt, Command
 from typing import Annotated, TypedDict, List
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 import uuid
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.approvals import ApprovalService
+from common.bounded_memory import BoundedMemorySaver
 
 llm = ChatGroq(model_name="llama3-8b-8192")
 
@@ -15,7 +21,7 @@ class State(TypedDict):
     human_feedback: Annotated[List[str], add_messages]
 
 
-def model(state: State):
+async def model(state: State):
     """Here we are using llm to generate a linkedin post with human feedback incorporated"""
 
     print("[Model] Generating Content")
@@ -36,7 +42,7 @@ def model(state: State):
     """
 
     # Here we generate the post
-    response = llm.invoke(
+    response = await llm.ainvoke(
         [
             SystemMessage(content="You are an expert Linkedin Content Writer"),
             HumanMessage(content=prompt),
@@ -104,31 +110,35 @@ graph.add_edge("model", "human_node")
 
 graph.set_finish_point("end_node")
 
-checkpointer = MemorySaver()
+checkpointer = BoundedMemorySaver()
 
 app = graph.compile(checkpointer=checkpointer)
 
-thread_config = {"configurable": {"thread_id": uuid.uuid4()}}
+from IPython.display import Image, display
 
-linkedin_topic = input("Enter a LinkedIn Topic : ")
+display(Image(app.get_graph().draw_mermaid_png()))
 
-initial_state = {
-    "linkedin_topic": linkedin_topic,
-    "generated_post": [],
-    "human_feedback": [],
-}
 
-from IPython.display import Image, display
+async def main():
+    # The run is parked in the checkpointer at every interrupt; the console below is
+    # just one reviewer of the pending queue, and any worker could answer instead
+    service = ApprovalService(app)
 
-display(Image(app.get_graph().draw_mermaid_png()))
+    # Console reads run in a worker thread so the event loop stays free
+    linkedin_topic = await asyncio.to_thread(input, "Enter a LinkedIn Topic : ")
+
+    initial_state = {
+        "linkedin_topic": linkedin_topic,
+        "generated_post": [],
+        "human_feedback": [],
+    }
+
+    await service.start(str(uuid.uuid4()), initial_state)
 
-for chunk in app.stream(initial_state, config=thread_config):
-    for node_id, value in chunk.items():
-        if node_id == "__interrupt__":
-            while True:
-                user_feedback = input("Enter your feedback or type 'done' to finish: ")
+    while pending := service.pending(limit=1):
+        approval = pending[0]
+        user_feedback = await asyncio.to_thread(input, approval.value["message"] + ": ")
+        await service.resume(approval.thread_id, user_feedback, approval.interrupt_id)
 
-                app.invoke(Command(resume=user_feedback), config=thread_config)
 
-                if user_feedback.lower() in ["done", "finish"]:
-                    break
+asyncio.run(main())
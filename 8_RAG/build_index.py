@@ -0,0 +1,38 @@
+"""Build or incrementally update the gym knowledge base index used by the RAG notebooks.
+
+Only files in knowledge_base/ whose content changed since the last run are
+re-embedded. Pass --rebuild to embed everything from scratch.
+
+Usage: python 8_RAG/build_index.py [--rebuild]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.vector_index import build_index
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Settings
+SOURCE_DIR = os.path.join(HERE, "knowledge_base")
+INDEX_DIR = os.path.join(HERE, "gym_index")
+
+
+def main():
+    start = time.perf_counter()
+    result = build_index(SOURCE_DIR, INDEX_DIR, rebuild="--rebuild" in sys.argv[1:])
+    elapsed = time.perf_counter() - start
+
+    print(f"Index version {result['version']} in {INDEX_DIR}")
+    print(
+        f"{result['sources']} sources: {result['changed']} changed, "
+        f"{result['unchanged']} unchanged, {result['removed']} removed"
+    )
+    print(f"Embedded {result['chunks_embedded']} chunks ({result['chunks_total']} total) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,82 @@
 from typing import TypedDict, Annotated, List
 from langgraph.graph import END, add_messages, StateGraph
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import AIMessage, HumanMessage, BaseMessage
 from dotenv import load_dotenv
 from langchain_community.tools import TavilySearchResults
 from langgraph.prebuilt import ToolNode
-from langchain_chroma import Chroma
+from langchain_core.runnables import RunnableConfig
 import time
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.schema import Document
 import uuid
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver, chat_loop
+from common.history_index import DEFAULT_THREAD, HistoryIndex
+from common.resources import get_chat_model, get_vector_store, lazy_resource
+from common.search_cache import cached_search_tool
 
 load_dotenv()
 MAX_WINDOW_SIZE = 10  # Increased for better context retention
 
-embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2",
-)
 
-# Initialize the vector store with an embedding function
-vector_store = Chroma(
-    collection_name="conversation_history",
-    embedding_function=embeddings,
-    persist_directory="db",
-)
+def conversation_store():
+    # Built on first use and shared process-wide; vectors are cached by content
+    # so the user's query is embedded once per turn
+    return get_vector_store(
+        "conversation_history",
+        path="db",
+        embeddings_path=os.path.join("db", "embedding_cache"),
+    )
+
+
+@lazy_resource
+def get_history():
+    # Message order lives in a SQLite sidecar so the recent window is read off
+    # an index instead of pulling and sorting the whole collection
+    os.makedirs("db", exist_ok=True)
+    history = HistoryIndex(os.path.join("db", "history_index.sqlite"))
+
+    # One-time backfill for collections created before the sidecar existed
+    if history.count() == 0:
+        existing = conversation_store().get(include=["metadatas"])
+        if existing["ids"]:
+            ordered = sorted(
+                zip(existing["ids"], existing["metadatas"]),
+                key=lambda x: x[1].get("timestamp", 0),
+            )
+            history.extend(
+                (doc_id, metadata.get("role", "unknown")) for doc_id, metadata in ordered
+            )
+    return history
 
 
 class BasicChatState(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
 
 
-llm = ChatAnthropic(model="claude-3-7-sonnet-20250219")
-
-search_tool = TavilySearchResults(max_results=4)
+search_tool = cached_search_tool(TavilySearchResults(max_results=4))
 tools = [search_tool]
 
-llm_with_tools = llm.bind_tools(tools=tools)
 
+@lazy_resource
+def get_llm_with_tools():
+    llm = get_chat_model("anthropic", "claude-3-7-sonnet-20250219")
+    return llm.bind_tools(tools=tools)
 
-def get_similar_from_recent(query, n_results=5):
-    """Retrieve relevant conversation history using semantic search."""
-    try:
-        all_documents = vector_store.get()
-
-        if not all_documents or len(all_documents["documents"]) == 0:
-            return []
 
-        # Sort documents by timestamp (newest first)
-        sorted_docs = sorted(
-            zip(
-                all_documents["documents"],
-                all_documents["metadatas"],
-                all_documents["ids"],
-            ),
-            key=lambda x: x[1]["timestamp"],
-            reverse=True,
-        )
-
-        # Take only the recent messages based on MAX_WINDOW_SIZE
-        recent_docs = sorted_docs[:MAX_WINDOW_SIZE]
-        recent_ids = [doc[2] for doc in recent_docs]
+async def get_similar_from_recent(query, thread_id=DEFAULT_THREAD, n_results=5):
+    """Retrieve relevant conversation history of one thread using semantic search."""
+    try:
+        # Take only the thread's recent messages based on MAX_WINDOW_SIZE; the
+        # id filter below therefore never matches other threads' messages
+        recent_ids = get_history().recent_ids(MAX_WINDOW_SIZE, thread_id)
 
         # First try with similarity search if we have enough documents
         if recent_ids:
-            similar_docs = vector_store.similarity_search(
+            similar_docs = await conversation_store().asimilarity_search(
                 query, k=n_results, filter={"id": {"$in": recent_ids}}
             )
             return similar_docs
@@ -74,35 +87,51 @@ def get_similar_from_recent(query, n_results=5):
         return []
 
 
-def store_message(content, role="human"):
-    """Store a message in the vector store with proper metadata."""
+async def store_turn(query, content, thread_id=DEFAULT_THREAD):
+    """Store a turn's human and AI messages in the vector store with proper metadata."""
     try:
-        doc_id = str(uuid.uuid4())
+        human_id = str(uuid.uuid4())
+        ai_id = str(uuid.uuid4())
         timestamp = time.time()
 
-        vector_store.add_documents(
+        # One call embeds both messages as a single batch; the query is
+        # already cached from the similarity search
+        await conversation_store().aadd_documents(
             [
+                Document(
+                    page_content=query,
+                    metadata={
+                        "timestamp": timestamp,
+                        "role": "human",
+                        "id": human_id,
+                        "thread_id": thread_id,
+                    },
+                ),
                 Document(
                     page_content=content,
-                    metadata={"timestamp": timestamp, "role": role, "id": doc_id},
-                )
+                    metadata={
+                        "timestamp": timestamp,
+                        "role": "ai",
+                        "id": ai_id,
+                        "thread_id": thread_id,
+                    },
+                ),
             ],
-            ids=[doc_id],
+            ids=[human_id, ai_id],
         )
+        await asyncio.to_thread(get_history().extend, [(human_id, "human"), (ai_id, "ai")], thread_id)
     except Exception:
         pass
 
 
-def chatbot(state: BasicChatState):
+async def chatbot(state: BasicChatState, config: RunnableConfig):
     """Process user query with conversation memory."""
-    # Get the user's query
+    # Get the user's query and the conversation it belongs to
     query = state["messages"][-1].content
-
-    # Store the user's message in the vector store
-    store_message(query, role="human")
+    thread_id = str(config.get("configurable", {}).get("thread_id") or DEFAULT_THREAD)
 
     # Retrieve relevant conversation history
-    context_docs = get_similar_from_recent(query)
+    context_docs = await get_similar_from_recent(query, thread_id)
 
     # Format context for the prompt
     if context_docs:
@@ -130,7 +159,7 @@ If the question asks about information that was mentioned in previous messages,
 """
 
     # Get response from the LLM
-    response = llm_with_tools.invoke(prompt)
+    response = await get_llm_with_tools().ainvoke(prompt)
 
     # Extract content from the response
     if hasattr(response, "content"):
@@ -149,8 +178,8 @@ If the question asks about information that was mentioned in previous messages,
     else:
         content = str(response)
 
-    # Store the AI's response
-    store_message(content, role="ai")
+    # Store the user's message and the AI's response
+    await store_turn(query, content, thread_id)
 
     return {"messages": [response]}
 
@@ -174,10 +203,5 @@ workflow.add_edge("tool_node", "chatbot")
 
 graph = workflow.compile()
 
-while True:
-    user_input = input("User : ")
-    if user_input.lower() == "exit":
-        break
-    else:
-        result = graph.invoke({"messages": [HumanMessage(content=user_input)]})
-        print(result["messages"][-1].content)
+if __name__ == "__main__":
+    asyncio.run(chat_loop(ConversationDriver(graph), thread_id=DEFAULT_THREAD))
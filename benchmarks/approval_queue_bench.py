@@ -0,0 +1,114 @@
+"""Cost of runs waiting for human review: blocked workers vs ApprovalService.
+
+Generates POSTS LinkedIn-style drafts that each stop for review, as in
+7_Human_in_the_loop/5_multiturn_conversation.py. The blocking style waits on
+the human inside the run, modelled as a worker thread parked on an Event (the
+way input() parks it). ApprovalService parks the run in the checkpointer
+instead. Reports OS threads and traced memory while all posts are waiting,
+then approves everything through the queue.
+
+Usage: python benchmarks/approval_queue_bench.py
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+
+from langgraph.graph import END, StateGraph
+from langgraph.types import Command, interrupt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.approvals import ApprovalService
+from common.bounded_memory import BoundedMemorySaver
+
+# Settings
+POSTS = 2_000
+DRAFT = "Five lessons from shipping LangGraph agents to production. " * 10
+
+reviews = []  # One Event per blocked worker, set when the "human" answers
+
+
+class PostState(TypedDict):
+    topic: str
+    post: str
+    approved: bool
+
+
+def write(state: PostState):
+    return {"post": f"{state['topic']}: {DRAFT}"}
+
+
+def blocking_review(state: PostState):
+    # Stands in for input(): the worker sleeps until a human answers
+    answered = threading.Event()
+    reviews.append(answered)
+    answered.wait()
+    return {"approved": True}
+
+
+def interrupt_review(state: PostState):
+    decision = interrupt({"post": state["post"], "message": "Approve? (yes/no)"})
+    return Command(goto=END, update={"approved": decision == "yes"})
+
+
+def build(review, checkpointer=None):
+    graph = StateGraph(PostState)
+    graph.add_node("write", write)
+    graph.add_node("review", review)
+    graph.set_entry_point("write")
+    graph.add_edge("write", "review")
+    return graph.compile(checkpointer=checkpointer)
+
+
+def measure(label: str, start_memory: int):
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    print(
+        f"{label:<16} {threading.active_count():>8} threads "
+        f"{(current - start_memory) / 1024 / 1024:>8.1f} MiB"
+    )
+
+
+def run_blocking():
+    app = build(blocking_review)
+    start_memory = tracemalloc.get_traced_memory()[0]
+    with ThreadPoolExecutor(max_workers=POSTS) as pool:
+        futures = [pool.submit(app.invoke, {"topic": f"Post {i}"}) for i in range(POSTS)]
+        while len(reviews) < POSTS:
+            time.sleep(0.01)
+        measure("blocking", start_memory)
+        for answered in reviews:
+            answered.set()
+        assert all(future.result()["approved"] for future in futures)
+
+
+async def run_service():
+    service = ApprovalService(build(interrupt_review, BoundedMemorySaver(max_threads=POSTS)))
+    start_memory = tracemalloc.get_traced_memory()[0]
+    await asyncio.gather(*(service.start(f"post-{i}", {"topic": f"Post {i}"}) for i in range(POSTS)))
+    assert len(service.queue) == POSTS
+    measure("ApprovalService", start_memory)
+
+    start = time.perf_counter()
+    for approval in service.pending():
+        state = await service.resume(approval.thread_id, "yes", approval.interrupt_id)
+        assert state.values["approved"]
+    print(f"Approved {POSTS} posts from the queue in {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    print(f"{POSTS} posts waiting for review")
+    tracemalloc.start()
+    run_blocking()
+    asyncio.run(run_service())
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
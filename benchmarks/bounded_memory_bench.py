@@ -0,0 +1,91 @@
+"""Resident memory of MemorySaver vs BoundedMemorySaver for a long-running chatbot.
+
+Simulates THREADS users of an add_messages chatbot, TURNS turns each, spread
+round-robin so every thread stays active. Memory is measured with tracemalloc
+after every REPORT_EVERY threads. A final pass revisits evicted threads to
+check that BoundedMemorySaver reloads them from the spill store with their
+history intact.
+
+Usage: python benchmarks/bounded_memory_bench.py
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.bounded_memory import BoundedMemorySaver
+from common.sqlite_checkpointer import DeltaSqliteSaver
+
+# Settings
+THREADS = 2_000
+TURNS = 5
+REPORT_EVERY = 500
+MAX_THREADS = 200  # BoundedMemorySaver thread cap
+MAX_CHECKPOINTS = 3
+SPILL_CACHE_BYTES = 1024 * 1024  # Delta-detection cache of the spill store, which is memory too
+ANSWER = "Sure, here is what I found about that topic. " * 8
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list[BaseMessage], add_messages]
+
+
+def chatbot(state: ChatState):
+    return {"messages": [AIMessage(content=ANSWER)]}
+
+
+def build(checkpointer):
+    graph = StateGraph(ChatState)
+    graph.add_node("chatbot", chatbot)
+    graph.set_entry_point("chatbot")
+    graph.add_edge("chatbot", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def run(name: str, checkpointer) -> float:
+    app = build(checkpointer)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for done in range(REPORT_EVERY, THREADS + 1, REPORT_EVERY):
+        for turn in range(TURNS):
+            for thread in range(done - REPORT_EVERY, done):
+                config = {"configurable": {"thread_id": f"user-{thread}"}}
+                app.invoke({"messages": [HumanMessage(content=f"Turn {turn}: tell me more")]}, config)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        print(f"{name:<20} {done:>7} threads  {current / 1024 / 1024:>8.1f} MiB")
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return elapsed
+
+
+def main():
+    print(f"{THREADS} threads x {TURNS} turns")
+    elapsed = run("MemorySaver", MemorySaver())
+    print(f"{'MemorySaver':<20} {elapsed:.1f}s\n")
+
+    path = os.path.join(tempfile.mkdtemp(), "spill.sqlite")
+    with DeltaSqliteSaver.from_conn_string(path, cache_bytes=SPILL_CACHE_BYTES) as spill:
+        saver = BoundedMemorySaver(max_checkpoints=MAX_CHECKPOINTS, max_threads=MAX_THREADS, spill=spill)
+        elapsed = run("BoundedMemorySaver", saver)
+        print(f"{'BoundedMemorySaver':<20} {elapsed:.1f}s  {saver.stats()}")
+
+        # user-0 was evicted long ago; its history must come back from the spill store
+        app = build(saver)
+        state = app.get_state({"configurable": {"thread_id": "user-0"}})
+        assert len(state.values["messages"]) == TURNS * 2, "evicted thread lost its history"
+        print(f"Reloaded user-0 with {len(state.values['messages'])} messages  {saver.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Load test for the async chatbot path.
+
+Runs the memory chatbot graph against a fake LLM with fixed latency and reports
+how throughput scales with the number of concurrent thread_ids.
+
+Usage: python benchmarks/chatbot_load_test.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Annotated, TypedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver
+from common.fake_llm import SlowFakeChatModel
+
+# Settings
+CONCURRENCY_LEVELS = [1, 10, 50, 100, 250, 500]
+TURNS_PER_THREAD = 5
+LLM_LATENCY = 0.05  # Seconds per fake LLM call
+
+llm = SlowFakeChatModel(latency=LLM_LATENCY)
+
+
+class BasicChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+async def chatbot(state: BasicChatState):
+    return {"messages": [await llm.ainvoke(state["messages"])]}
+
+
+def build_app():
+    graph = StateGraph(BasicChatState)
+    graph.add_node("chatbot", chatbot)
+    graph.set_entry_point("chatbot")
+    graph.add_edge("chatbot", END)
+    return graph.compile(checkpointer=MemorySaver())
+
+
+async def run_level(concurrency: int) -> dict:
+    driver = ConversationDriver(build_app(), max_concurrency=concurrency)
+    latencies = []
+
+    async def run_thread(thread_id):
+        for turn in range(TURNS_PER_THREAD):
+            start = time.perf_counter()
+            await driver.send(thread_id, f"message {turn} from {thread_id}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_thread(f"thread-{i}") for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "threads": concurrency,
+        "turns": len(latencies),
+        "turns_per_sec": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+async def main():
+    print(f"Fake LLM latency: {LLM_LATENCY * 1000:.0f} ms, {TURNS_PER_THREAD} turns per thread")
+    print(f"{'threads':>8} {'turns':>8} {'turns/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in CONCURRENCY_LEVELS:
+        result = await run_level(concurrency)
+        print(
+            f"{result['threads']:>8} {result['turns']:>8} {result['turns_per_sec']:>10.1f} "
+            f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
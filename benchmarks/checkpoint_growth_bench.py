@@ -0,0 +1,168 @@
+"""Checkpoint bytes and serialization time per turn: full-state, delta and trimmed nodes.
+
+Runs the classify -> retrieve -> generate RAG graph for TURNS turns on one
+thread in three styles:
+- full: plain list state, nodes mutate and return the whole state
+- delta: reducers and nodes returning only what they change
+- trimmed: delta nodes plus trim_window in the classifier, as in the 8_RAG
+  notebooks, so old exchanges are removed from the state
+No LLM or embedding model is involved; documents and answers are fixed strings.
+
+Delta nodes keep writes constant, but the messages blob still grows with the
+conversation; only trimming makes the per-turn cost constant.
+
+For every turn it reports what the checkpointer had to serialize:
+- writes: the values nodes returned (put_writes)
+- blobs: the channel values stored because their version changed (put)
+
+Usage: python benchmarks/checkpoint_growth_bench.py
+"""
+
+import os
+import sys
+import time
+from typing import Annotated, TypedDict
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.message_window import trim_window
+
+# Settings
+TURNS = 200
+REPORT_TURNS = [1, 10, 50, 100, 150, 200]
+WINDOW_SIZE = 3
+
+DOCUMENTS = [
+    Document(page_content=f"Peak Performance Gym document {i}. " + "Opening hours and plans. " * 12)
+    for i in range(3)
+]
+ANSWER = "Peak Performance Gym is open Monday through Friday from 5:00 AM to 11:00 PM. " * 3
+
+
+class MeasuringSaver(MemorySaver):
+    """MemorySaver that tallies the bytes and time spent serializing what it stores"""
+
+    def __init__(self):
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        self.write_bytes = 0
+        self.blob_bytes = 0
+        self.seconds = 0.0
+
+    def _measure(self, values) -> int:
+        start = time.perf_counter()
+        size = sum(len(self.serde.dumps_typed(value)[1]) for value in values)
+        self.seconds += time.perf_counter() - start
+        return size
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        values = checkpoint["channel_values"]
+        self.blob_bytes += self._measure(values[c] for c in new_versions if c in values)
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        self.write_bytes += self._measure(value for _, value in writes)
+        return super().put_writes(config, writes, task_id, task_path)
+
+
+class FullState(TypedDict):
+    messages: list[BaseMessage]
+    documents: list[Document]
+    on_topic: str
+
+
+def full_classifier(state: FullState):
+    state["on_topic"] = "Yes"
+    return state
+
+
+def full_retrieve(state: FullState):
+    state["documents"] = list(DOCUMENTS)
+    return state
+
+
+def full_generate(state: FullState):
+    state["messages"].append(AIMessage(content=ANSWER))
+    return state
+
+
+class DeltaState(TypedDict):
+    messages: Annotated[list[BaseMessage], add_messages]
+    documents: list[Document]
+    on_topic: str
+
+
+def delta_classifier(state: DeltaState):
+    return {"on_topic": "Yes"}
+
+
+def trimmed_classifier(state: DeltaState):
+    removals, _, _ = trim_window(state["messages"], WINDOW_SIZE)
+    return {"messages": removals, "on_topic": "Yes"}
+
+
+def delta_retrieve(state: DeltaState):
+    return {"documents": list(DOCUMENTS)}
+
+
+def delta_generate(state: DeltaState):
+    return {"messages": [AIMessage(content=ANSWER)]}
+
+
+def build(state_type, classifier, retrieve, generate, checkpointer):
+    workflow = StateGraph(state_type)
+    workflow.add_node("topic_decision", classifier)
+    workflow.add_node("retrieve", retrieve)
+    workflow.add_node("generate_answer", generate)
+    workflow.set_entry_point("topic_decision")
+    workflow.add_edge("topic_decision", "retrieve")
+    workflow.add_edge("retrieve", "generate_answer")
+    workflow.add_edge("generate_answer", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def run(graph, saver: MeasuringSaver, full_history: bool) -> dict:
+    config = {"configurable": {"thread_id": "bench"}}
+    per_turn = {}
+    for turn in range(1, TURNS + 1):
+        question = HumanMessage(content=f"Question {turn}: what are the opening hours?")
+        if full_history:
+            # Without a reducer the caller has to pass the whole history back in
+            history = graph.get_state(config).values.get("messages", [])
+            inputs = {"messages": history + [question]}
+        else:
+            inputs = {"messages": [question]}
+
+        saver.reset()
+        graph.invoke(inputs, config)
+        per_turn[turn] = (saver.write_bytes, saver.blob_bytes, saver.seconds * 1000)
+    return per_turn
+
+
+def main():
+    full_saver, delta_saver = MeasuringSaver(), MeasuringSaver()
+    full = run(build(FullState, full_classifier, full_retrieve, full_generate, full_saver), full_saver, True)
+    delta = run(build(DeltaState, delta_classifier, delta_retrieve, delta_generate, delta_saver), delta_saver, False)
+    trimmed_saver = MeasuringSaver()
+    trimmed = run(
+        build(DeltaState, trimmed_classifier, delta_retrieve, delta_generate, trimmed_saver), trimmed_saver, False
+    )
+
+    print(f"Bytes serialized per turn over {TURNS} turns (writes = node outputs, blobs = changed channels)")
+    print(f"{'':>5} | {'full':^30} | {'delta':^30} | {'trimmed':^30}")
+    print(f"{'turn':>5}" + f" | {'writes':>10} {'blobs':>10} {'ms':>8}" * 3)
+    for turn in REPORT_TURNS:
+        row = f"{turn:>5}"
+        for writes, blobs, ms in (full[turn], delta[turn], trimmed[turn]):
+            row += f" | {writes:>10} {blobs:>10} {ms:>8.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Checkpoint bytes and resume time: JsonPlusSerializer vs CompactSerializer.
+
+Runs a tool-calling chatbot shaped like 6_Chatbot/2_tool_chatbot (system
+prompt, tool call, tool result, answer) for THREADS threads of TURNS turns on
+SqliteSaver, once with the default serializer and once with CompactSerializer
+backed by a blob table in the same file. The system prompt and a few tool
+results repeat across turns and threads, as they do in practice.
+
+Resume time is get_state on every thread from a freshly opened database, so
+the blob cache starts cold.
+
+Usage: python benchmarks/checkpoint_serde_bench.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.compact_serde import BlobStore, CompactSerializer
+
+# Settings
+THREADS = 20
+TURNS = 20
+SYSTEM_PROMPT = "You are a helpful research assistant. Cite your sources and answer concisely. " * 20
+SEARCH_RESULTS = [
+    f"Result {i}: " + "Peak Performance Gym opens at 5:00 AM and closes at 11:00 PM on weekdays. " * 15
+    for i in range(5)
+]
+ANSWER = "According to the search results, the gym is open from 5 AM to 11 PM on weekdays. " * 3
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def chatbot(state: ChatState):
+    turn = sum(isinstance(message, HumanMessage) for message in state["messages"])
+    call_id = f"call_{turn}"
+    return {
+        "messages": [
+            AIMessage(content="", tool_calls=[{"name": "search", "args": {"query": "gym hours"}, "id": call_id}]),
+            ToolMessage(content=SEARCH_RESULTS[turn % len(SEARCH_RESULTS)], tool_call_id=call_id),
+            AIMessage(content=ANSWER),
+        ]
+    }
+
+
+def build(checkpointer):
+    graph = StateGraph(ChatState)
+    graph.add_node("chatbot", chatbot)
+    graph.set_entry_point("chatbot")
+    graph.add_edge("chatbot", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def run(path: str, serde_factory) -> tuple:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    app = build(SqliteSaver(conn, serde=serde_factory()))
+    start = time.perf_counter()
+    for thread in range(THREADS):
+        config = {"configurable": {"thread_id": str(thread)}}
+        for turn in range(TURNS):
+            messages = [HumanMessage(content=f"Question {turn}: when are you open?")]
+            if turn == 0:
+                messages.insert(0, SystemMessage(content=SYSTEM_PROMPT))
+            app.invoke({"messages": messages}, config)
+    write_seconds = time.perf_counter() - start
+    conn.close()
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+    app = build(SqliteSaver(conn, serde=serde_factory()))
+    start = time.perf_counter()
+    for thread in range(THREADS):
+        state = app.get_state({"configurable": {"thread_id": str(thread)}})
+        assert len(state.values["messages"]) == 1 + TURNS * 4, "resumed state is incomplete"
+    resume_seconds = time.perf_counter() - start
+    conn.execute("VACUUM")
+    conn.close()
+    return os.path.getsize(path), write_seconds, resume_seconds
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    default_path = os.path.join(directory, "default.sqlite")
+    compact_path = os.path.join(directory, "compact.sqlite")
+
+    results = [
+        ("JsonPlusSerializer", run(default_path, lambda: None)),
+        ("CompactSerializer", run(compact_path, lambda: CompactSerializer(BlobStore(compact_path)))),
+    ]
+
+    print(f"{THREADS} threads x {TURNS} turns on SqliteSaver")
+    print(f"{'serializer':<20} {'db MB':>8} {'write s':>8} {'resume ms':>10}")
+    for name, (size, write_seconds, resume_seconds) in results:
+        print(f"{name:<20} {size / 1024 / 1024:>8.2f} {write_seconds:>8.2f} {resume_seconds * 1000:>10.1f}")
+    print(f"Size reduction: {results[0][1][0] / results[1][1][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
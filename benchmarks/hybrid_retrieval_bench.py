@@ -0,0 +1,188 @@
+"""Recall@k and latency of dense, BM25 and hybrid retrieval on a synthetic corpus.
+
+Builds CORPUS_SIZE gym-style chunks, each naming a unique trainer and price,
+and indexes them in an in-memory Chroma collection and a BM25Index. Dense
+vectors come from a small hashing embedding that, like a real sentence model,
+understands synonyms but blurs rare exact tokens such as names and prices.
+
+Two query sets are run against each retriever:
+- exact: look up the one chunk with a given price (favours BM25)
+- paraphrase: ask for a trainer's class using synonyms only; any chunk with
+  that trainer first name, activity, time and level counts (favours dense)
+
+recall@k is the fraction of queries with a relevant chunk in the top k.
+
+Usage: python benchmarks/hybrid_retrieval_bench.py
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+import zlib
+from typing import List
+
+import chromadb
+import numpy as np
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.hybrid_retriever import HybridRetriever, tokenize
+
+# Settings
+CORPUS_SIZE = 100_000
+QUERIES = 200  # Per query set
+K = 4
+EMBEDDING_SIZE = 64  # Small on purpose: rare tokens collide, as in a real model
+HASH_BUCKETS = 4096
+INSERT_BATCH_SIZE = 5000
+SEED = 7
+
+FIRST_NAMES = ["neha", "marcus", "arjun", "priya", "rahul", "sara", "vikram", "anita", "dev", "meera"]
+SYLLABLES = ["ka", "ran", "mo", "li", "sha", "ter", "vo", "na", "pel", "du", "ris", "gan", "to", "we", "bi"]
+
+# Words on the same line mean the same thing to the dense embedding only
+SYNONYM_GROUPS = [
+    ["yoga", "stretching", "flexibility"],
+    ["spin", "cycling", "bike"],
+    ["strength", "weights", "lifting"],
+    ["swimming", "pool", "laps"],
+    ["boxing", "sparring", "punching"],
+    ["pilates", "core", "reformer"],
+    ["morning", "sunrise", "early"],
+    ["evening", "night", "late"],
+    ["beginner", "novice", "newcomer"],
+    ["advanced", "expert", "experienced"],
+]
+CANONICAL = {word: group[0] for group in SYNONYM_GROUPS for word in group}
+
+
+class HashingEmbeddings(Embeddings):
+    """Bag-of-words embedding: each canonical token maps to a fixed random vector"""
+
+    def __init__(self):
+        rng = np.random.default_rng(SEED)
+        self.table = rng.standard_normal((HASH_BUCKETS, EMBEDDING_SIZE)).astype(np.float32)
+
+    def _embed(self, text: str) -> List[float]:
+        buckets = [
+            zlib.crc32(CANONICAL.get(token, token).encode()) % HASH_BUCKETS for token in tokenize(text)
+        ]
+        vector = self.table[buckets].sum(axis=0)
+        return (vector / max(np.linalg.norm(vector), 1e-12)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def make_corpus(rng: random.Random):
+    texts, facts = [], []
+    for i in range(CORPUS_SIZE):
+        first_name = FIRST_NAMES[i % len(FIRST_NAMES)]
+        number = i // len(FIRST_NAMES)
+        surname = "".join(SYLLABLES[number // len(SYLLABLES) ** j % len(SYLLABLES)] for j in range(4))
+        price = 1000 + i
+        activity = rng.choice(rng.choice(SYNONYM_GROUPS[:6]))
+        time_of_day = rng.choice(rng.choice(SYNONYM_GROUPS[6:8]))
+        level = rng.choice(rng.choice(SYNONYM_GROUPS[8:]))
+        texts.append(
+            f"Trainer {first_name} {surname} runs {level} {activity} sessions in the "
+            f"{time_of_day} and charges ₹{price}/session at Peak Performance Gym."
+        )
+        facts.append((first_name, price, activity, time_of_day, level))
+    return texts, facts
+
+
+def synonym(word: str, rng: random.Random) -> str:
+    group = next(group for group in SYNONYM_GROUPS if word in group)
+    return rng.choice([other for other in group if other != word])
+
+
+def topic(fact) -> tuple:
+    first_name, _, activity, time_of_day, level = fact
+    return first_name, CANONICAL[activity], CANONICAL[time_of_day], CANONICAL[level]
+
+
+def make_queries(facts, ids, rng: random.Random):
+    """Two lists of (query, set of relevant ids)"""
+    by_topic = {}
+    for i, fact in enumerate(facts):
+        by_topic.setdefault(topic(fact), set()).add(ids[i])
+
+    targets = rng.sample(range(len(facts)), QUERIES)
+    exact = [(f"Which trainer charges ₹{facts[i][1]}/session?", {ids[i]}) for i in targets]
+    paraphrase = []
+    for i in targets:
+        first_name, _, activity, time_of_day, level = facts[i]
+        query = (
+            f"Does {first_name} teach {synonym(level, rng)} {synonym(activity, rng)} "
+            f"{synonym(time_of_day, rng)}?"
+        )
+        paraphrase.append((query, by_topic[topic(facts[i])]))
+    return exact, paraphrase
+
+
+def evaluate(search, queries) -> dict:
+    hits, latencies = 0, []
+    for query, relevant in queries:
+        start = time.perf_counter()
+        found = search(query)
+        latencies.append(time.perf_counter() - start)
+        hits += any(key in relevant for key in found)
+    latencies.sort()
+    return {
+        "recall": hits / len(queries),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main():
+    rng = random.Random(SEED)
+    texts, facts = make_corpus(rng)
+    ids = [str(i) for i in range(CORPUS_SIZE)]
+    exact, paraphrase = make_queries(facts, ids, rng)
+    embeddings = HashingEmbeddings()
+
+    start = time.perf_counter()
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(f"bench_{uuid.uuid4().hex}", metadata={"hnsw:space": "cosine"})
+    for offset in range(0, CORPUS_SIZE, INSERT_BATCH_SIZE):
+        batch = slice(offset, offset + INSERT_BATCH_SIZE)
+        collection.add(
+            ids=ids[batch], documents=texts[batch], embeddings=embeddings.embed_documents(texts[batch])
+        )
+    vector_store = Chroma(client=client, collection_name=collection.name, embedding_function=embeddings)
+    print(f"Dense index: {CORPUS_SIZE} chunks in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    retriever = HybridRetriever.from_vector_store(vector_store, k=K)
+    elapsed = time.perf_counter() - start
+    print(f"BM25 index:  {len(retriever.bm25)} chunks, {len(retriever.bm25.vocabulary)} terms in {elapsed:.1f}s")
+
+    searches = {
+        "dense": lambda q: [doc.id for doc in vector_store.similarity_search(q, k=K)],
+        "bm25": lambda q: [retriever.documents[i].id for i, _ in retriever.bm25.search(q, K)],
+        "hybrid": lambda q: [doc.id for doc in retriever.invoke(q)],
+    }
+
+    print(f"\nrecall@{K}, {QUERIES} queries per set")
+    print(f"{'retriever':<10} {'query set':<11} {'recall':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, search in searches.items():
+        for set_name, queries in [("exact", exact), ("paraphrase", paraphrase)]:
+            result = evaluate(search, queries)
+            print(
+                f"{name:<10} {set_name:<11} {result['recall']:>7.3f} "
+                f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
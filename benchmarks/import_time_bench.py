@@ -0,0 +1,72 @@
+"""Import-time regression guard for the graph modules.
+
+Imports each module in a fresh interpreter, reports how long the import took,
+and fails if it exceeded IMPORT_BUDGET_SECONDS or pulled in one of the heavy
+libraries that must only be loaded on first use.
+
+Usage: python benchmarks/import_time_bench.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Settings
+IMPORT_BUDGET_SECONDS = 1.5
+MODULES = [
+    ("Task", "Chatbot"),
+    ("6_Chatbot", "5_chroma_chatbot"),
+    ("5_react_agent", "agent_reason_runnable"),
+]
+HEAVY_MODULES = ["torch", "sentence_transformers", "langchain_huggingface", "chromadb"]
+
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(folder: str, module: str) -> dict:
+    env = dict(os.environ)
+    # Clients validate their keys on construction; real keys are not needed
+    for key in ["ANTHROPIC_API_KEY", "GROQ_API_KEY", "TAVILY_API_KEY", "GOOGLE_API_KEY"]:
+        env.setdefault(key, "benchmark")
+
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=os.path.join(ROOT, folder),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    failures = []
+    print(f"{'module':<40} {'seconds':>8}  heavy imports")
+    for folder, module in MODULES:
+        result = measure(folder, module)
+        name = f"{folder}/{module}"
+        print(f"{name:<40} {result['seconds']:>8.3f}  {', '.join(result['heavy']) or '-'}")
+
+        if result["seconds"] > IMPORT_BUDGET_SECONDS:
+            failures.append(f"{name} took {result['seconds']:.3f}s (budget {IMPORT_BUDGET_SECONDS}s)")
+        if result["heavy"]:
+            failures.append(f"{name} imported {', '.join(result['heavy'])} at import time")
+
+    if failures:
+        print("\n".join(["", "Import-time regressions:"] + failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Checkpoint load/save cost per turn: slicing the prompt vs trimming the persisted window.
+
+Runs the 6_Chatbot memory chatbot shape for TURNS turns on one thread against
+a fixed-reply fake model, once with the old in-node slice (the LLM sees a
+window but the checkpoint keeps everything) and once with trim_window's
+RemoveMessage deltas. Summaries are off so only checkpoint cost is measured.
+
+Usage: python benchmarks/message_window_bench.py
+"""
+
+import os
+import sys
+import time
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.message_window import trim_window
+
+# Settings
+TURNS = 1_000
+REPORT_TURNS = [1, 10, 100, 500, 1_000]
+WINDOW_SIZE = 3
+ANSWER = "Here is a fairly typical chatbot reply of a few sentences. " * 4
+
+
+class BasicChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+class MeasuringSaver(MemorySaver):
+    """MemorySaver that tallies the time spent in get_tuple and put"""
+
+    def __init__(self):
+        super().__init__()
+        self.seconds = 0.0
+        self.stored_bytes = 0
+
+    def get_tuple(self, config):
+        start = time.perf_counter()
+        result = super().get_tuple(config)
+        self.seconds += time.perf_counter() - start
+        return result
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        start = time.perf_counter()
+        result = super().put(config, checkpoint, metadata, new_versions)
+        self.seconds += time.perf_counter() - start
+        values = checkpoint["channel_values"]
+        self.stored_bytes = sum(len(self.serde.dumps_typed(values[c])[1]) for c in values)
+        return result
+
+
+def sliced_chatbot(state: BasicChatState):
+    if len(state["messages"]) > WINDOW_SIZE * 2:
+        state["messages"] = state["messages"][-WINDOW_SIZE * 2 :]
+    return {"messages": [AIMessage(content=ANSWER)]}
+
+
+def trimmed_chatbot(state: BasicChatState):
+    removals, _, _ = trim_window(state["messages"], WINDOW_SIZE)
+    return {"messages": removals + [AIMessage(content=ANSWER)]}
+
+
+def run(chatbot) -> dict:
+    saver = MeasuringSaver()
+    graph = StateGraph(BasicChatState)
+    graph.add_node("chatbot", chatbot)
+    graph.set_entry_point("chatbot")
+    graph.add_edge("chatbot", END)
+    app = graph.compile(checkpointer=saver)
+
+    config = {"configurable": {"thread_id": "bench"}}
+    per_turn = {}
+    for turn in range(1, TURNS + 1):
+        saver.seconds = 0.0
+        app.invoke({"messages": [HumanMessage(content=f"Message {turn}")]}, config)
+        per_turn[turn] = (saver.seconds * 1000, saver.stored_bytes)
+    return per_turn
+
+
+def main():
+    sliced, trimmed = run(sliced_chatbot), run(trimmed_chatbot)
+    print(f"Checkpointer time and state size per turn, window of {WINDOW_SIZE} exchanges")
+    print(f"{'turn':>5} | {'slice ms':>9} {'slice bytes':>12} | {'trim ms':>8} {'trim bytes':>11}")
+    for turn in REPORT_TURNS:
+        sms, sbytes = sliced[turn]
+        tms, tbytes = trimmed[turn]
+        print(f"{turn:>5} | {sms:>9.2f} {sbytes:>12} | {tms:>8.2f} {tbytes:>11}")
+
+
+if __name__ == "__main__":
+    main()
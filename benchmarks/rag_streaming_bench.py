@@ -0,0 +1,106 @@
+"""Time to first token vs total latency for the RAG graph, blocking and streamed.
+
+Runs a classify -> retrieve -> generate graph shaped like
+8_RAG/2_classification_driven_agent against fake chat models with fixed
+latencies. The classifier model is tagged "nostream" like the notebook's
+grader, so only generate_answer tokens reach the caller.
+
+Usage: python benchmarks/rag_streaming_bench.py
+"""
+
+import os
+import statistics
+import sys
+import time
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.answer_stream import StreamTiming, stream_answer
+from common.fake_llm import SlowFakeChatModel
+
+# Settings
+RUNS = 20
+CLASSIFIER_LATENCY = 0.15  # Seconds for the classifier's whole reply
+ANSWER_FIRST_TOKEN = 0.3  # Seconds until the answer model's first token
+ANSWER_TOKEN_LATENCY = 0.02  # Seconds between answer tokens
+ANSWER = " ".join(["Peak Performance Gym is open from 5:00 AM to 11:00 PM on weekdays."] * 5)
+
+classifier_llm = SlowFakeChatModel(latency=CLASSIFIER_LATENCY, response="Yes").with_config(
+    tags=["nostream"]
+)
+answer_llm = SlowFakeChatModel(
+    latency=ANSWER_FIRST_TOKEN, token_latency=ANSWER_TOKEN_LATENCY, response=ANSWER
+)
+
+
+class AgentState(TypedDict):
+    messages: Annotated[list[BaseMessage], add_messages]
+    on_topic: str
+
+
+def question_classifier(state: AgentState, config: RunnableConfig):
+    return {"on_topic": classifier_llm.invoke(state["messages"], config).content}
+
+
+def retrieve(state: AgentState):
+    return {}
+
+
+def generate_answer(state: AgentState, config: RunnableConfig):
+    return {"messages": [answer_llm.invoke(state["messages"], config)]}
+
+
+def build_graph():
+    workflow = StateGraph(AgentState)
+    workflow.add_node("topic_decision", question_classifier)
+    workflow.add_node("retrieve", retrieve)
+    workflow.add_node("generate_answer", generate_answer)
+    workflow.set_entry_point("topic_decision")
+    workflow.add_edge("topic_decision", "retrieve")
+    workflow.add_edge("retrieve", "generate_answer")
+    workflow.add_edge("generate_answer", END)
+    return workflow.compile()
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    graph = build_graph()
+    inputs = {"messages": [HumanMessage(content="What are the opening hours?")]}
+
+    blocking = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        graph.invoke(inputs)
+        blocking.append(time.perf_counter() - start)
+
+    first_token, streamed_total = [], []
+    for _ in range(RUNS):
+        timing = StreamTiming()
+        answer = "".join(stream_answer(graph, inputs, timing=timing))
+        assert answer == ANSWER, "streamed answer does not match the model reply"
+        first_token.append(timing.time_to_first_token)
+        streamed_total.append(timing.total)
+
+    print(f"{RUNS} runs, {len(ANSWER.split())} answer tokens")
+    print(f"{'':<28} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, values in [
+        ("invoke: first visible text", blocking),
+        ("stream: time to first token", first_token),
+        ("stream: total", streamed_total),
+    ]:
+        print(
+            f"{name:<28} {statistics.median(values) * 1000:>8.0f} "
+            f"{percentile(values, 0.99) * 1000:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""DeltaSqliteSaver vs the stock SqliteSaver: bytes written per turn and turns/sec.
+
+Runs THREADS conversations of TURNS turns each concurrently from a thread
+pool against the memory chatbot graph with an instant fake LLM, once per
+checkpointer, each on a fresh database file. Database size is measured after
+folding the WAL back into the main file.
+
+Usage: python benchmarks/sqlite_checkpointer_bench.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fake_llm import SlowFakeChatModel
+from common.sqlite_checkpointer import DeltaSqliteSaver
+
+# Settings
+THREADS = 50
+TURNS = 40
+LLM_LATENCY = 0.0  # Seconds per fake LLM call; 0 isolates checkpointer cost
+MESSAGE = "How do I book a personal training session and what does it cost? " * 3
+
+llm = SlowFakeChatModel(latency=LLM_LATENCY)
+
+
+class BasicChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def chatbot(state: BasicChatState):
+    return {"messages": [llm.invoke(state["messages"])]}
+
+
+def build_app(checkpointer):
+    graph = StateGraph(BasicChatState)
+    graph.add_node("chatbot", chatbot)
+    graph.set_entry_point("chatbot")
+    graph.add_edge("chatbot", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def run_threads(app) -> float:
+    def run_thread(thread_id: str):
+        config = {"configurable": {"thread_id": thread_id}}
+        for turn in range(TURNS):
+            app.invoke({"messages": [HumanMessage(content=f"{turn}: {MESSAGE}")]}, config)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(run_thread, [f"thread-{i}" for i in range(THREADS)]))
+    return time.perf_counter() - start
+
+
+def database_bytes(path: str) -> int:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return os.path.getsize(path)
+
+
+def bench_stock(path: str) -> dict:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    elapsed = run_threads(build_app(SqliteSaver(conn)))
+    conn.close()
+    return {"seconds": elapsed, "bytes": database_bytes(path)}
+
+
+def bench_delta(path: str) -> dict:
+    with DeltaSqliteSaver.from_conn_string(path) as saver:
+        elapsed = run_threads(build_app(saver))
+        stats = saver.stats()
+    return {"seconds": elapsed, "bytes": database_bytes(path), **stats}
+
+
+def main():
+    turns = THREADS * TURNS
+    with tempfile.TemporaryDirectory() as directory:
+        results = {
+            "SqliteSaver": bench_stock(os.path.join(directory, "stock.sqlite")),
+            "DeltaSqliteSaver": bench_delta(os.path.join(directory, "delta.sqlite")),
+        }
+
+    print(f"{THREADS} concurrent threads x {TURNS} turns")
+    print(f"{'checkpointer':<18} {'turns/sec':>10} {'db MB':>8} {'bytes/turn':>11}")
+    for name, result in results.items():
+        print(
+            f"{name:<18} {turns / result['seconds']:>10.1f} "
+            f"{result['bytes'] / 1e6:>8.2f} {result['bytes'] / turns:>11.0f}"
+        )
+
+    delta = results["DeltaSqliteSaver"]
+    print(f"\nGroup commit: {delta['requests_per_transaction']:.1f} write requests per transaction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Retrieval latency of thread-scoped chat memory as the number of threads grows.
+
+Fills an in-memory Chroma collection with MESSAGES_PER_THREAD messages for an
+increasing number of threads and compares a global similarity search with the
+thread-filtered search used by the Chroma chatbots.
+
+Usage: python benchmarks/thread_isolation_bench.py
+"""
+
+import statistics
+import time
+import uuid
+
+import chromadb
+from langchain_chroma import Chroma
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# Settings
+THREAD_COUNTS = [1, 10, 100, 1000]
+MESSAGES_PER_THREAD = 20
+QUERIES = 50
+EMBEDDING_SIZE = 384  # Same width as all-MiniLM-L6-v2
+
+
+def fill(db: Chroma, first_thread: int, last_thread: int):
+    texts, metadatas, ids = [], [], []
+    for thread in range(first_thread, last_thread):
+        for i in range(MESSAGES_PER_THREAD):
+            texts.append(f"thread {thread} message {i} about topic {i % 7}")
+            metadatas.append({"thread_id": f"thread-{thread}", "timestamp": time.time()})
+            ids.append(str(uuid.uuid4()))
+    if texts:
+        db.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+
+
+def time_search(db: Chroma, search_kwargs: dict) -> float:
+    latencies = []
+    for i in range(QUERIES):
+        start = time.perf_counter()
+        db.similarity_search(f"question about topic {i % 7}", **search_kwargs)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    db = Chroma(
+        client=chromadb.EphemeralClient(),
+        collection_name=f"bench_{uuid.uuid4().hex}",
+        embedding_function=DeterministicFakeEmbedding(size=EMBEDDING_SIZE),
+    )
+
+    print(f"{MESSAGES_PER_THREAD} messages per thread, median of {QUERIES} searches")
+    print(f"{'threads':>8} {'messages':>9} {'global ms':>10} {'thread ms':>10}")
+
+    filled = 0
+    for thread_count in THREAD_COUNTS:
+        fill(db, filled, thread_count)
+        filled = thread_count
+
+        global_ms = time_search(db, {"k": 3})
+        thread_ms = time_search(db, {"k": 3, "filter": {"thread_id": "thread-0"}})
+        print(
+            f"{thread_count:>8} {thread_count * MESSAGES_PER_THREAD:>9} "
+            f"{global_ms:>10.2f} {thread_ms:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
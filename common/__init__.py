@@ -0,0 +1,5 @@
+"""Helpers shared by the chapter scripts and notebooks.
+
+Chapter folders are not importable packages, so scripts add the repository root
+to ``sys.path`` before importing from ``common``.
+"""
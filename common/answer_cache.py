@@ -0,0 +1,193 @@
+import copy
+import hashlib
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel
+
+# Settings
+DEFAULT_SIMILARITY_THRESHOLD = 0.92  # Questions at least this similar share an answer
+DEFAULT_TTL = 60 * 60  # Seconds an answer stays valid
+DEFAULT_MAX_ENTRIES = 5_000  # Least recently used answers are evicted beyond this
+
+
+def _copy_answer(answer: Any) -> Any:
+    """Fresh copy, so a caller that mutates the answer (add_messages assigns ids) never touches the cache"""
+    return answer.model_copy() if isinstance(answer, BaseModel) else copy.copy(answer)
+
+
+def documents_key(documents: Union[str, Sequence[Document]]) -> str:
+    """Order-independent hash of a retrieved document set (or an already formatted context)"""
+    if isinstance(documents, str):
+        parts = [documents]
+    else:
+        parts = sorted(
+            hashlib.sha1(document.page_content.encode("utf-8")).hexdigest() for document in documents
+        )
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class SemanticAnswerCache:
+    """Answers reused across paraphrased questions over the same retrieved documents.
+
+    Question vectors live in one preallocated float32 matrix, so a lookup is a
+    single matrix-vector product over at most max_entries rows, masked to the
+    entries whose document-set key matches. Because the key is a hash of the
+    retrieved documents, editing the knowledge base changes what is retrieved
+    and the old answers simply stop matching. Entries expire after ttl
+    seconds; when full, the least recently used entry is replaced.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None  # Allocated on first store
+        self._keys = np.full(max_entries, -1, dtype=np.int64)  # Interned document-set key per slot
+        self._created_at = np.zeros(max_entries, dtype=np.float64)
+        self._last_access = np.zeros(max_entries, dtype=np.float64)
+        self._answers: List[Any] = [None] * max_entries
+        # Document-set key <-> id, kept only while some slot uses the id
+        self._key_ids: Dict[str, int] = {}
+        self._key_refs: Dict[int, list] = {}  # id -> [key, slots using it]
+        self._next_key_id = itertools.count()
+
+    def _embed(self, question: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    def _retain(self, key: str) -> int:
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = self._key_ids[key] = next(self._next_key_id)
+            self._key_refs[key_id] = [key, 0]
+        self._key_refs[key_id][1] += 1
+        return key_id
+
+    def _unref(self, slots: np.ndarray):
+        for key_id in self._keys[slots].tolist():
+            if key_id < 0:
+                continue
+            entry = self._key_refs[key_id]
+            entry[1] -= 1
+            if not entry[1]:
+                del self._key_refs[key_id]
+                del self._key_ids[entry[0]]
+
+    def lookup(self, question: str, documents) -> Optional[Any]:
+        """Cached answer for a similar question over the same documents, or None"""
+        vector = self._embed(question)
+        key = documents_key(documents)
+        now = time.time()
+
+        with self._lock:
+            key_id = self._key_ids.get(key)
+            if self._vectors is None or key_id is None:
+                self.misses += 1
+                return None
+
+            live = self._keys >= 0
+            stale = live & (now - self._created_at > self.ttl)
+            if stale.any():
+                self._release(np.flatnonzero(stale))
+                live &= ~stale
+
+            candidates = np.flatnonzero(live & (self._keys == key_id))
+            if len(candidates) == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors[candidates] @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            slot = candidates[best]
+            self._last_access[slot] = now
+            self.hits += 1
+            return self._answers[slot]
+
+    def store(self, question: str, documents, answer: Any):
+        vector = self._embed(question)
+        key = documents_key(documents)
+        now = time.time()
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+
+            free = np.flatnonzero(self._keys < 0)
+            if len(free):
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(self._last_access))
+                self._unref(np.array([slot]))
+                self.evicted += 1
+
+            self._vectors[slot] = vector
+            self._keys[slot] = self._retain(key)
+            self._created_at[slot] = now
+            self._last_access[slot] = now
+            self._answers[slot] = answer
+
+    def _release(self, slots: np.ndarray):
+        self._unref(slots)
+        self._keys[slots] = -1
+        self._last_access[slots] = 0.0
+        for slot in slots:
+            self._answers[slot] = None
+        self.expired += len(slots)
+
+    def clear(self):
+        with self._lock:
+            self._keys[:] = -1
+            self._answers = [None] * self.max_entries
+            self._key_ids.clear()
+            self._key_refs.clear()
+
+    def wrap(
+        self, chain: Runnable, question_field: str = "question", documents_field: str = "context"
+    ) -> Runnable:
+        """Runnable taking the chain's input dict that only calls the chain on a cache miss"""
+
+        def invoke(inputs: dict, config: RunnableConfig):
+            question, documents = inputs[question_field], inputs[documents_field]
+            answer = self.lookup(question, documents)
+            if answer is None:
+                answer = chain.invoke(inputs, config)
+                self.store(question, documents, _copy_answer(answer))
+                return answer
+            return _copy_answer(answer)
+
+        return RunnableLambda(invoke, name="semantic_answer_cache")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": int((self._keys >= 0).sum()),
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
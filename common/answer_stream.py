@@ -0,0 +1,117 @@
+"""Token streaming for the RAG graphs.
+
+stream_answer / astream_answer run a compiled graph and yield the answer text
+as it is generated: LLM tokens from the answer node, or the whole message
+from nodes that answer without streaming (fixed replies, cached answers).
+Every other node, such as classifiers and graders, runs as usual and yields
+nothing.
+"""
+
+import time
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+# Settings
+DEFAULT_STREAM_NODES = ("generate_answer",)  # Nodes whose LLM tokens are yielded
+DEFAULT_ANSWER_NODES = ("generate_answer", "cannot_answer", "off_topic_response")
+
+
+class StreamTiming:
+    """Time to first token and total latency of one streamed answer"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.time_to_first_token: Optional[float] = None
+        self.total: Optional[float] = None
+        self.chunks = 0
+
+    def record_chunk(self):
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.perf_counter() - self.start
+        self.chunks += 1
+
+    def finish(self):
+        self.total = time.perf_counter() - self.start
+
+    def __repr__(self) -> str:
+        ttft = f"{self.time_to_first_token * 1000:.0f}ms" if self.time_to_first_token is not None else "-"
+        total = f"{self.total * 1000:.0f}ms" if self.total is not None else "-"
+        return f"StreamTiming(ttft={ttft}, total={total}, chunks={self.chunks})"
+
+
+def _answer_texts(update: dict, answer_nodes: Iterable[str]) -> Iterator[tuple]:
+    """(node, text) for every AI message an answer node wrote in an "updates" event"""
+    for node, values in update.items():
+        if node not in answer_nodes or not values:
+            continue
+        for message in values.get("messages", []):
+            if isinstance(message, AIMessage) and message.content:
+                yield node, message.content
+
+
+def _text(chunk) -> str:
+    return chunk.content if isinstance(chunk, AIMessageChunk) and isinstance(chunk.content, str) else ""
+
+
+def stream_answer(
+    graph,
+    inputs: dict,
+    config: Optional[dict] = None,
+    timing: Optional[StreamTiming] = None,
+    stream_nodes: Iterable[str] = DEFAULT_STREAM_NODES,
+    answer_nodes: Iterable[str] = DEFAULT_ANSWER_NODES,
+) -> Iterator[str]:
+    """Yield answer text as it arrives; fills timing if given"""
+    streamed = set()
+    for mode, event in graph.stream(inputs, config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            chunk, metadata = event
+            node = metadata.get("langgraph_node")
+            text = _text(chunk)
+            if node in stream_nodes and text:
+                streamed.add(node)
+                if timing is not None:
+                    timing.record_chunk()
+                yield text
+        else:
+            for node, text in _answer_texts(event, answer_nodes):
+                # Already yielded token by token, unless the reply was not streamed
+                if node not in streamed:
+                    if timing is not None:
+                        timing.record_chunk()
+                    yield text
+                streamed.discard(node)
+    if timing is not None:
+        timing.finish()
+
+
+async def astream_answer(
+    graph,
+    inputs: dict,
+    config: Optional[dict] = None,
+    timing: Optional[StreamTiming] = None,
+    stream_nodes: Iterable[str] = DEFAULT_STREAM_NODES,
+    answer_nodes: Iterable[str] = DEFAULT_ANSWER_NODES,
+) -> AsyncIterator[str]:
+    """Async version of stream_answer for the chat widget"""
+    streamed = set()
+    async for mode, event in graph.astream(inputs, config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            chunk, metadata = event
+            node = metadata.get("langgraph_node")
+            text = _text(chunk)
+            if node in stream_nodes and text:
+                streamed.add(node)
+                if timing is not None:
+                    timing.record_chunk()
+                yield text
+        else:
+            for node, text in _answer_texts(event, answer_nodes):
+                if node not in streamed:
+                    if timing is not None:
+                        timing.record_chunk()
+                    yield text
+                streamed.discard(node)
+    if timing is not None:
+        timing.finish()
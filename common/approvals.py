@@ -0,0 +1,252 @@
+"""Non-blocking human-in-the-loop: park interrupted runs, resume them from any worker.
+
+Calling input() while a graph runs ties up a worker (and, in a server, a
+request) for as long as the human takes. ApprovalService runs a graph until
+it finishes or hits interrupt(), records every interrupt in a pending
+approvals queue, and returns. The run itself stays parked in the checkpointer.
+Whoever answers later calls resume() with the response, which claims the
+queue entry and continues the run with Command(resume=...).
+
+With a path, the queue is a SQLite table. Workers in other processes that
+open the same queue file and the same persistent checkpointer can then list
+and resume each other's runs. A claim is an atomic lease, so two reviewers
+can never resume the same interrupt. The row is deleted only once the resumed
+run is parked again. If the worker dies mid-resume, the lease expires and the
+approval is pending again. The queue's SQLite calls run in worker threads, off
+the event loop. Parked runs cost one queue row plus their checkpoints: no
+thread, task or coroutine waits on them.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.types import Command
+
+# Settings
+DEFAULT_MAX_CONCURRENCY = 256  # Graph runs (starts and resumes) in flight at once
+DEFAULT_CLAIM_LEASE = 10 * 60  # Seconds a claimed approval stays hidden; must outlast a resumed run
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_approvals (
+    thread_id TEXT NOT NULL,
+    interrupt_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    PRIMARY KEY (thread_id, interrupt_id)
+);
+CREATE INDEX IF NOT EXISTS pending_approvals_created ON pending_approvals (created_at);
+"""
+
+
+class ApprovalNotPendingError(KeyError):
+    """The interrupt was already resumed, possibly by another worker, or never existed"""
+
+
+class PendingApproval:
+    """One interrupt waiting for a human response"""
+
+    __slots__ = ("thread_id", "interrupt_id", "value", "created_at", "claimed_by")
+
+    def __init__(
+        self, thread_id: str, interrupt_id: str, value: Any, created_at: float, claimed_by: Optional[str] = None
+    ):
+        self.thread_id = thread_id
+        self.interrupt_id = interrupt_id
+        self.value = value
+        self.created_at = created_at
+        self.claimed_by = claimed_by  # Lease token while a worker is resuming it
+
+    def __repr__(self) -> str:
+        return f"PendingApproval(thread_id={self.thread_id!r}, interrupt_id={self.interrupt_id!r})"
+
+
+class ApprovalQueue:
+    """Pending approvals, oldest first, in memory or in a SQLite file shared by workers"""
+
+    def __init__(self, path: Optional[str] = None, serde=None, lease: float = DEFAULT_CLAIM_LEASE):
+        self.serde = serde if serde is not None else JsonPlusSerializer()
+        self.lease = lease
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None)
+        if path is not None:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _rows(self, approvals) -> list:
+        rows = []
+        for approval in approvals:
+            value_type, payload = self.serde.dumps_typed(approval.value)
+            rows.append((approval.thread_id, approval.interrupt_id, approval.created_at, value_type, payload))
+        return rows
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def add(self, thread_id: str, interrupt_id: str, value: Any, created_at: Optional[float] = None):
+        self.park([PendingApproval(thread_id, interrupt_id, value, created_at or time.time())])
+
+    def park(self, approvals: Sequence[PendingApproval], resolved: Optional[PendingApproval] = None):
+        """Add a run's new interrupts and delete the approval it resumed, in one transaction"""
+        rows = self._rows(approvals)
+        with self._transaction():
+            if resolved is not None:
+                self._conn.execute(
+                    "DELETE FROM pending_approvals WHERE thread_id = ? AND interrupt_id = ? AND claimed_by = ?",
+                    (resolved.thread_id, resolved.interrupt_id, resolved.claimed_by),
+                )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO pending_approvals VALUES (?, ?, ?, ?, ?, NULL, NULL)", rows
+            )
+
+    def claim(self, thread_id: str, interrupt_id: Optional[str] = None) -> PendingApproval:
+        """Lease the entry (the thread's oldest if no interrupt_id); only one caller wins.
+
+        The entry stays in the table, hidden from list() and other claims, until
+        park(resolved=...) deletes it, release() returns it, or the lease runs out.
+        """
+        now = time.time()
+        query = (
+            "SELECT * FROM pending_approvals WHERE thread_id = ? "
+            "AND (claimed_at IS NULL OR claimed_at < ?)"
+        )
+        params: tuple = (thread_id, now - self.lease)
+        if interrupt_id is not None:
+            query += " AND interrupt_id = ?"
+            params += (interrupt_id,)
+        token = uuid.uuid4().hex
+        with self._transaction():
+            row = self._conn.execute(query + " ORDER BY created_at LIMIT 1", params).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE pending_approvals SET claimed_by = ?, claimed_at = ? "
+                    "WHERE thread_id = ? AND interrupt_id = ?",
+                    (token, now, *row[:2]),
+                )
+        if row is None:
+            raise ApprovalNotPendingError(f"no pending approval for thread {thread_id!r}")
+        approval = self._approval(row)
+        approval.claimed_by = token
+        return approval
+
+    def release(self, approval: PendingApproval):
+        """Give a claimed entry back, e.g. after its resumed run failed"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pending_approvals SET claimed_by = NULL, claimed_at = NULL "
+                "WHERE thread_id = ? AND interrupt_id = ? AND claimed_by = ?",
+                (approval.thread_id, approval.interrupt_id, approval.claimed_by),
+            )
+
+    def list(self, limit: Optional[int] = None, thread_id: Optional[str] = None) -> List[PendingApproval]:
+        """Entries waiting for a human: unclaimed, or claimed by a worker whose lease ran out"""
+        query = "SELECT * FROM pending_approvals WHERE (claimed_at IS NULL OR claimed_at < ?)"
+        params: tuple = (time.time() - self.lease,)
+        if thread_id is not None:
+            query, params = query + " AND thread_id = ?", params + (thread_id,)
+        query += " ORDER BY created_at"
+        if limit is not None:
+            query, params = query + " LIMIT ?", params + (limit,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._approval(row) for row in rows]
+
+    def _approval(self, row) -> PendingApproval:
+        thread_id, interrupt_id, created_at, value_type, payload = row[:5]
+        return PendingApproval(thread_id, interrupt_id, self.serde.loads_typed((value_type, payload)), created_at)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pending_approvals").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+class ApprovalService:
+    """Starts and resumes graph runs without ever waiting on a human"""
+
+    def __init__(
+        self,
+        app,
+        queue: Optional[ApprovalQueue] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        if app.checkpointer is None:
+            raise ValueError("interrupted runs are parked in the checkpointer; compile the graph with one")
+        self.app = app
+        self.queue = queue if queue is not None else ApprovalQueue()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # thread_id -> [lock, users]; dropped when unused so parked threads hold nothing here
+        self._thread_locks: Dict[str, list] = {}
+
+    @staticmethod
+    def config(thread_id: str) -> dict:
+        return {"configurable": {"thread_id": thread_id}}
+
+    @asynccontextmanager
+    async def _thread_lock(self, thread_id: str):
+        """Runs of one thread in this worker happen one at a time, in order"""
+        entry = self._thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._thread_locks[thread_id]
+
+    async def _run(self, thread_id: str, inputs: Any, resolved: Optional[PendingApproval] = None):
+        """Run until the graph ends or interrupts; park any interrupts; return the state snapshot"""
+        config = self.config(thread_id)
+        async with self._thread_lock(thread_id):
+            if resolved is not None:
+                state = await self.app.aget_state(config)
+                if resolved.interrupt_id not in {pending.id for pending in state.interrupts}:
+                    # Answered by a worker that died before deleting the entry
+                    await asyncio.to_thread(self.queue.park, [], resolved)
+                    raise ApprovalNotPendingError(f"interrupt {resolved.interrupt_id!r} was already resumed")
+            async with self._semaphore:
+                await self.app.ainvoke(inputs, config)
+            state = await self.app.aget_state(config)
+            now = time.time()
+            parked = [PendingApproval(thread_id, pending.id, pending.value, now) for pending in state.interrupts]
+            await asyncio.to_thread(self.queue.park, parked, resolved)
+        return state
+
+    async def start(self, thread_id: str, inputs: Any):
+        """Run a new thread; returns its state, with state.interrupts set if it is now waiting"""
+        return await self._run(thread_id, inputs)
+
+    async def resume(self, thread_id: str, response: Any, interrupt_id: Optional[str] = None):
+        """Answer a pending interrupt and continue its run; raises ApprovalNotPendingError if taken"""
+        approval = await asyncio.to_thread(self.queue.claim, thread_id, interrupt_id)
+        try:
+            return await self._run(thread_id, Command(resume={approval.interrupt_id: response}), approval)
+        except ApprovalNotPendingError:
+            raise
+        except BaseException:
+            # Give it back so the approval is not lost with the failed run
+            await asyncio.to_thread(self.queue.release, approval)
+            raise
+
+    def pending(self, limit: Optional[int] = None, thread_id: Optional[str] = None) -> List[PendingApproval]:
+        """Approvals waiting for a human, oldest first"""
+        return self.queue.list(limit, thread_id)
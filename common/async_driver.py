@@ -0,0 +1,82 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import HumanMessage
+
+# Settings
+DEFAULT_MAX_CONCURRENCY = 256  # Maximum number of graph runs in flight at once
+
+
+def default_input(user_input: str) -> dict:
+    return {"messages": [HumanMessage(content=user_input)]}
+
+
+def default_output(result: dict) -> str:
+    return result["messages"][-1].content
+
+
+class ConversationDriver:
+    """Serves many conversations from one event loop.
+
+    Turns of the same thread_id run one after another so the checkpointer sees
+    them in order, while different threads run concurrently up to
+    max_concurrency graph runs.
+    """
+
+    def __init__(
+        self,
+        app,
+        build_input: Callable[[str], dict] = default_input,
+        read_output: Callable[[dict], Any] = default_output,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self.app = app
+        self.build_input = build_input
+        self.read_output = read_output
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # thread_id -> [lock, users]; dropped when unused so finished threads hold nothing here
+        self._thread_locks: Dict[Optional[str], list] = {}
+
+    @asynccontextmanager
+    async def _thread_lock(self, thread_id: Optional[str]):
+        entry = self._thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._thread_locks[thread_id]
+
+    async def send(self, thread_id: Optional[str], user_input: str) -> Any:
+        """Run one turn and return its reply"""
+        config = {"configurable": {"thread_id": thread_id}} if thread_id else None
+
+        async with self._thread_lock(thread_id):
+            async with self._semaphore:
+                result = await self.app.ainvoke(self.build_input(user_input), config=config)
+
+        return self.read_output(result)
+
+    async def run_conversations(self, conversations: Dict[str, List[str]]) -> Dict[str, list]:
+        """Play every thread's turns in order, with all threads running concurrently"""
+
+        async def run_thread(thread_id, turns):
+            return [await self.send(thread_id, turn) for turn in turns]
+
+        replies = await asyncio.gather(
+            *(run_thread(thread_id, turns) for thread_id, turns in conversations.items())
+        )
+        return dict(zip(conversations.keys(), replies))
+
+
+async def chat_loop(driver: ConversationDriver, thread_id: Optional[str] = None):
+    """Interactive console loop that reads input without blocking the event loop"""
+    while True:
+        user_input = await asyncio.to_thread(input, "User : ")
+        if user_input.lower() == "exit":
+            break
+        else:
+            print(await driver.send(thread_id, user_input))
@@ -0,0 +1,467 @@
+"""In-memory checkpointer with bounded history, bounded thread count and optional spill.
+
+MemorySaver keeps every checkpoint of every thread for the life of the
+process. BoundedMemorySaver keeps only the latest max_checkpoints per thread
+and namespace, and at most max_threads threads, evicting the least recently
+used one. With a spill checkpointer (e.g. DeltaSqliteSaver), an evicted
+thread is written there and loaded back the next time it is used, so a
+returning user resumes where they left off. Spill store I/O happens outside
+the lock that guards the resident threads, and the async methods run it in a
+worker thread, so neither other threads nor the event loop wait on the disk.
+
+Checkpoints are held serialized, which makes stats()["bytes"] an exact
+measure of the payload held in memory.
+"""
+
+import asyncio
+import random
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+# Settings
+DEFAULT_MAX_CHECKPOINTS = 5  # Latest checkpoints kept per thread and namespace
+DEFAULT_MAX_THREADS = 10_000  # Least recently used threads are evicted beyond this
+
+
+class StoredCheckpoint:
+    __slots__ = ("checkpoint", "metadata", "parent_id", "writes", "size")
+
+    def __init__(self, checkpoint: tuple, metadata: tuple, parent_id: Optional[str]):
+        self.checkpoint = checkpoint  # (type, bytes) from the serializer
+        self.metadata = metadata
+        self.parent_id = parent_id
+        self.writes: Dict[Tuple[str, int], Tuple[str, str, tuple, str]] = {}
+        self.size = len(checkpoint[1]) + len(metadata[1])
+
+
+# thread_id -> checkpoint_ns -> checkpoint_id -> StoredCheckpoint, oldest first
+Thread = Dict[str, "OrderedDict[str, StoredCheckpoint]"]
+
+
+class BoundedMemorySaver(BaseCheckpointSaver):
+    """MemorySaver replacement whose memory use is bounded regardless of traffic"""
+
+    def __init__(
+        self,
+        max_checkpoints: int = DEFAULT_MAX_CHECKPOINTS,
+        max_threads: int = DEFAULT_MAX_THREADS,
+        spill: Optional[BaseCheckpointSaver] = None,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        if max_checkpoints < 1 or max_threads < 1:
+            raise ValueError("max_checkpoints and max_threads must be at least 1")
+
+        self.max_checkpoints = max_checkpoints
+        self.max_threads = max_threads
+        self.spill = spill
+        self.evictions = 0
+        self.spilled = 0
+        self.reloads = 0
+
+        self._threads: "OrderedDict[Any, Thread]" = OrderedDict()
+        self._bytes = 0
+        # In-memory state only; spill store I/O runs under _spill_lock instead
+        self._lock = threading.RLock()
+        self._spill_lock = threading.Lock()
+        self._spilling: Dict[Any, tuple] = {}  # Evicted, not yet written: thread_id -> (eviction, thread)
+        self._pins: Dict[Any, int] = {}  # Threads in use, which eviction skips
+
+    # Thread residency
+
+    @contextmanager
+    def _pinned(self, thread_id, create: bool):
+        """Make the thread resident (reloading it if needed) and keep it from eviction until exit"""
+        with self._lock:
+            self._pins[thread_id] = self._pins.get(thread_id, 0) + 1
+        try:
+            self._load(thread_id, create)
+            yield
+        finally:
+            with self._lock:
+                self._pins[thread_id] -= 1
+                if not self._pins[thread_id]:
+                    del self._pins[thread_id]
+                self._evict()
+            self._drain()
+
+    def _load(self, thread_id, create: bool):
+        with self._lock:
+            if self._resident(thread_id) is not None:
+                return
+            if self.spill is None:
+                if create:
+                    self._insert(thread_id, {})
+                return
+
+        # Disk I/O happens under the spill lock only, so resident threads are never kept waiting
+        with self._spill_lock:
+            with self._lock:
+                if self._resident(thread_id) is not None:
+                    return
+            thread = self._reload(thread_id)
+            if thread is None and not create:
+                return
+            with self._lock:
+                self._insert(thread_id, thread or {})
+
+    def _resident(self, thread_id) -> Optional[Thread]:
+        """The thread if it is in memory, taking it back from the spill queue if it is waiting there"""
+        thread = self._threads.get(thread_id)
+        if thread is not None:
+            self._threads.move_to_end(thread_id)
+            return thread
+        entry = self._spilling.pop(thread_id, None)
+        if entry is None:
+            return None
+        self._insert(thread_id, entry[1])
+        return entry[1]
+
+    def _insert(self, thread_id, thread: Thread):
+        self._threads[thread_id] = thread
+        self._bytes += self._thread_bytes(thread)
+        self._evict()
+
+    def _evict(self):
+        excess = len(self._threads) - self.max_threads
+        if excess <= 0:
+            return
+        # Threads in use are skipped; the cap is restored once they are released
+        victims = list(islice((tid for tid in self._threads if tid not in self._pins), excess))
+        for thread_id in victims:
+            thread = self._threads.pop(thread_id)
+            self._bytes -= self._thread_bytes(thread)
+            self.evictions += 1
+            if self.spill is not None and thread:
+                self._spilling[thread_id] = (self.evictions, thread)
+
+    def _thread_bytes(self, thread: Thread) -> int:
+        return sum(
+            stored.size + sum(len(write[2][1]) for write in stored.writes.values())
+            for checkpoints in thread.values()
+            for stored in checkpoints.values()
+        )
+
+    def _drain(self):
+        """Write evicted threads to the spill store, outside self._lock"""
+        # Whoever holds the spill lock drains the queue when it is done, so nobody waits for it
+        while self._spilling and self._spill_lock.acquire(blocking=False):
+            try:
+                while True:
+                    with self._lock:
+                        if not self._spilling:
+                            break
+                        thread_id, entry = next(iter(self._spilling.items()))
+                        # Stays queued while it is written, so a reader can still take it back
+                        snapshot = self._snapshot(entry[1])
+                    self._spill(thread_id, snapshot)
+                    with self._lock:
+                        written = self._spilling.get(thread_id) is entry
+                        if written:
+                            del self._spilling[thread_id]
+                    if not written:
+                        # Taken back or deleted while being written; this copy is stale
+                        self._delete_spilled(thread_id)
+            finally:
+                self._spill_lock.release()
+
+    def _snapshot(self, thread: Thread) -> list:
+        return [
+            (checkpoint_ns, stored.checkpoint, stored.metadata, stored.parent_id, sorted(stored.writes.items()))
+            for checkpoint_ns, checkpoints in thread.items()
+            for stored in checkpoints.values()
+        ]
+
+    def _spill(self, thread_id, snapshot: list):
+        for checkpoint_ns, typed_checkpoint, typed_metadata, parent_id, writes in snapshot:
+            checkpoint = self.serde.loads_typed(typed_checkpoint)
+            config = {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_id,
+                }
+            }
+            saved = self.spill.put(
+                config,
+                checkpoint,
+                self.serde.loads_typed(typed_metadata),
+                checkpoint["channel_versions"],
+            )
+            by_task: Dict[str, List[Tuple[str, Any]]] = {}
+            paths = {}
+            for (task_id, _), (_, channel, value, task_path) in writes:
+                by_task.setdefault(task_id, []).append((channel, self.serde.loads_typed(value)))
+                paths[task_id] = task_path
+            for task_id, task_writes in by_task.items():
+                self.spill.put_writes(saved, task_writes, task_id, paths[task_id])
+        self.spilled += 1
+
+    def _delete_spilled(self, thread_id):
+        try:
+            self.spill.delete_thread(thread_id)
+        except NotImplementedError:
+            pass  # The stale copy is overwritten by the next spill
+
+    def _reload(self, thread_id) -> Optional[Thread]:
+        tuples = list(self.spill.list({"configurable": {"thread_id": thread_id}}))
+        if not tuples:
+            return None
+
+        thread: Thread = {}
+        # list() is newest first; keep the newest max_checkpoints per namespace, stored oldest first
+        for checkpoint_tuple in reversed(tuples):
+            configurable = checkpoint_tuple.config["configurable"]
+            parent = checkpoint_tuple.parent_config
+            stored = StoredCheckpoint(
+                self.serde.dumps_typed(checkpoint_tuple.checkpoint),
+                self.serde.dumps_typed(checkpoint_tuple.metadata),
+                parent["configurable"]["checkpoint_id"] if parent else None,
+            )
+            for idx, (task_id, channel, value) in enumerate(checkpoint_tuple.pending_writes or []):
+                stored.writes[(task_id, WRITES_IDX_MAP.get(channel, idx))] = (
+                    task_id,
+                    channel,
+                    self.serde.dumps_typed(value),
+                    "",
+                )
+            checkpoints = thread.setdefault(configurable.get("checkpoint_ns", ""), OrderedDict())
+            checkpoints[configurable["checkpoint_id"]] = stored
+            while len(checkpoints) > self.max_checkpoints:
+                checkpoints.popitem(last=False)
+
+        self.reloads += 1
+        self._delete_spilled(thread_id)
+        return thread
+
+    # Writing
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        stored = StoredCheckpoint(
+            self.serde.dumps_typed(checkpoint),
+            self.serde.dumps_typed(dict(metadata)),
+            configurable.get("checkpoint_id"),
+        )
+
+        with self._pinned(thread_id, create=True), self._lock:
+            checkpoints = self._threads[thread_id].setdefault(checkpoint_ns, OrderedDict())
+            previous = checkpoints.pop(checkpoint["id"], None)
+            if previous is not None:
+                self._bytes -= previous.size
+            checkpoints[checkpoint["id"]] = stored
+            self._bytes += stored.size
+
+            while len(checkpoints) > self.max_checkpoints:
+                _, dropped = checkpoints.popitem(last=False)
+                self._bytes -= dropped.size + sum(len(write[2][1]) for write in dropped.writes.values())
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        with self._pinned(configurable["thread_id"], create=True), self._lock:
+            stored = self._threads[configurable["thread_id"]].get(configurable.get("checkpoint_ns", ""), {}).get(configurable["checkpoint_id"])
+            if stored is None:
+                return  # Checkpoint already rotated out of the retained window
+
+            for idx, (channel, value) in enumerate(writes):
+                key = (task_id, WRITES_IDX_MAP.get(channel, idx))
+                if key[1] >= 0 and key in stored.writes:
+                    continue
+                typed = self.serde.dumps_typed(value)
+                if key in stored.writes:
+                    self._bytes -= len(stored.writes[key][2][1])
+                stored.writes[key] = (task_id, channel, typed, task_path)
+                self._bytes += len(typed[1])
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            thread = self._threads.pop(thread_id, None)
+            if thread is not None:
+                self._bytes -= self._thread_bytes(thread)
+            self._spilling.pop(thread_id, None)
+        if self.spill is not None:
+            with self._spill_lock:
+                self._delete_spilled(thread_id)
+            self._drain()
+
+    # Reading
+
+    def _tuple(self, thread_id, checkpoint_ns: str, checkpoint_id: str, stored: StoredCheckpoint) -> CheckpointTuple:
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed(stored.checkpoint),
+            metadata=self.serde.loads_typed(stored.metadata),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": stored.parent_id,
+                }
+            }
+            if stored.parent_id
+            else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed(value))
+                for (task_id, channel, value, _) in stored.writes.values()
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        with self._pinned(thread_id, create=False), self._lock:
+            thread = self._threads.get(thread_id)
+            checkpoints = thread.get(checkpoint_ns) if thread else None
+            if not checkpoints:
+                return None
+            if checkpoint_id is None:
+                checkpoint_id = next(reversed(checkpoints))
+            stored = checkpoints.get(checkpoint_id)
+            if stored is None:
+                return None
+            return self._tuple(thread_id, checkpoint_ns, checkpoint_id, stored)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        before_id = get_checkpoint_id(before) if before else None
+        results = []
+        pin = self._pinned(config["configurable"]["thread_id"], create=False) if config else nullcontext()
+        with pin, self._lock:
+            if config:
+                thread = self._threads.get(config["configurable"]["thread_id"])
+                threads = [(config["configurable"]["thread_id"], thread)] if thread else []
+            else:
+                threads = list(self._threads.items())
+
+            for thread_id, thread in threads:
+                for checkpoint_ns, checkpoints in thread.items():
+                    if config and config["configurable"].get("checkpoint_ns") not in (None, checkpoint_ns):
+                        continue
+                    for checkpoint_id in reversed(checkpoints):
+                        if config and get_checkpoint_id(config) not in (None, checkpoint_id):
+                            continue
+                        if before_id and checkpoint_id >= before_id:
+                            continue
+                        stored = checkpoints[checkpoint_id]
+                        if filter:
+                            metadata = self.serde.loads_typed(stored.metadata)
+                            if any(metadata.get(key) != value for key, value in filter.items()):
+                                continue
+                        results.append(self._tuple(thread_id, checkpoint_ns, checkpoint_id, stored))
+                        if limit is not None and len(results) >= limit:
+                            return iter(results)
+        return iter(results)
+
+    async def _offload(self, method, *args, **kwargs):
+        """Run a sync method in a worker thread when it may touch the spill store"""
+        if self.spill is None:
+            return method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self._offload(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint_tuple in await self._offload(self.list, config, filter=filter, before=before, limit=limit):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await self._offload(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self._offload(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self._offload(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "checkpoints": sum(
+                    len(checkpoints) for thread in self._threads.values() for checkpoints in thread.values()
+                ),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "spilled": self.spilled,
+                "reloads": self.reloads,
+            }
@@ -0,0 +1,253 @@
+"""Compact checkpoint serializer: msgpack messages, deduplicated strings, zstd.
+
+Pass it to any checkpointer as serde=CompactSerializer(...). It differs from
+the default JsonPlusSerializer in four ways:
+- LangChain messages are written as msgpack arrays of their non-default
+  fields, instead of the constructor path and every field.
+- Strings of DEDUP_MIN_LENGTH characters or more (system prompts, tool
+  results, long answers) are stored once in a content-addressed BlobStore and
+  referenced by a 16-byte hash, however many checkpoints repeat them.
+- Payloads over COMPRESS_THRESHOLD bytes are zstd-compressed.
+- Messages are rebuilt with model_construct, skipping pydantic validation of
+  data that was validated when it was written, and deduplicated strings come
+  from an in-process LRU cache instead of the blob table.
+
+Everything else (documents, Send, sets, custom classes) falls back to
+JsonPlusSerializer inside the compact payload, and data written by another
+serializer is still read, so an existing checkpoint database keeps working.
+The in-memory BlobStore is never pruned; give it a path for long-running
+processes.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from copy import copy
+from typing import Any, Dict, Optional, Tuple
+
+import ormsgpack
+import zstandard
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    ChatMessage,
+    FunctionMessage,
+    HumanMessage,
+    HumanMessageChunk,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+# Settings
+DEDUP_MIN_LENGTH = 256  # Characters; shorter strings are cheaper inline than as a reference
+COMPRESS_THRESHOLD = 1024  # Bytes; smaller payloads are not worth a zstd frame
+COMPRESSION_LEVEL = 3
+BLOB_CACHE_SIZE = 4096  # Deduplicated strings kept decoded in memory
+BUSY_TIMEOUT = 30  # Seconds to wait for another connection's write lock on the blob table
+
+TYPE_NAME = "compact"
+RAW, ZSTD = b"\x00", b"\x01"
+
+# msgpack extension types
+EXT_FALLBACK, EXT_BLOB, EXT_MESSAGE, EXT_TUPLE, EXT_BIGINT = 1, 2, 3, 4, 5
+# msgpack integers are 64-bit; wider ones are written as decimal text in an EXT_BIGINT
+INT_MIN, INT_MAX = -(2**63), 2**64 - 1
+
+MESSAGE_CLASSES = {
+    cls.model_fields["type"].default: cls
+    for cls in (
+        AIMessage,
+        AIMessageChunk,
+        ChatMessage,
+        FunctionMessage,
+        HumanMessage,
+        HumanMessageChunk,
+        RemoveMessage,
+        SystemMessage,
+        ToolMessage,
+    )
+}
+# Field defaults per message type, computed once: pydantic's get_default is slow enough to dominate
+MESSAGE_DEFAULTS = {
+    type_: {
+        name: field.get_default(call_default_factory=True)
+        for name, field in cls.model_fields.items()
+        if not field.is_required()
+    }
+    for type_, cls in MESSAGE_CLASSES.items()
+}
+PACK_OPTIONS = ormsgpack.OPT_NON_STR_KEYS
+
+
+class BlobStore:
+    """Content-addressed string table, in memory or in a SQLite file"""
+
+    def __init__(self, path: Optional[str] = None, cache_size: int = BLOB_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._memory: Dict[bytes, bytes] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            # Usually the checkpointer's file: wait out its writers instead of failing with "database is locked"
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+            self._conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS serde_blobs (hash BLOB PRIMARY KEY, data BLOB NOT NULL)")
+            self._conn.commit()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _remember(self, key: bytes, text: str):
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def put_many(self, blobs: Dict[bytes, str]):
+        """Store new strings; must finish before a checkpoint referencing them is written"""
+        with self._lock:
+            new = {key: text for key, text in blobs.items() if key not in self._cache}
+            for key, text in blobs.items():
+                self._remember(key, text)
+            if not new:
+                return
+            rows = [(key, compress(text.encode("utf-8"))) for key, text in new.items()]
+            if self._conn is None:
+                self._memory.update(rows)
+            else:
+                self._conn.executemany("INSERT OR IGNORE INTO serde_blobs (hash, data) VALUES (?, ?)", rows)
+                self._conn.commit()
+
+    def get(self, key: bytes) -> str:
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+            if self._conn is None:
+                data = self._memory.get(key)
+            else:
+                row = self._conn.execute("SELECT data FROM serde_blobs WHERE hash = ?", (key,)).fetchone()
+                data = row[0] if row else None
+            if data is None:
+                raise KeyError(f"blob {key.hex()} is missing from the blob store")
+            text = decompress(data).decode("utf-8")
+            self._remember(key, text)
+            return text
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return len(self._memory)
+            return self._conn.execute("SELECT COUNT(*) FROM serde_blobs").fetchone()[0]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+
+def compress(data: bytes) -> bytes:
+    if len(data) < COMPRESS_THRESHOLD:
+        return RAW + data
+    return ZSTD + zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(data)
+
+
+def decompress(data: bytes) -> bytes:
+    if data[:1] == ZSTD:
+        return zstandard.ZstdDecompressor().decompress(data[1:])
+    return data[1:]
+
+
+class CompactSerializer:
+    """SerializerProtocol implementation producing ("compact", bytes) payloads"""
+
+    def __init__(self, blobs: Optional[BlobStore] = None, fallback=None):
+        self.blobs = blobs if blobs is not None else BlobStore()
+        self.fallback = fallback if fallback is not None else JsonPlusSerializer()
+
+    # Encoding
+
+    def _encode(self, obj: Any, new_blobs: Dict[bytes, str]) -> Any:
+        # Exact types only: str and int subclasses such as enums go through the fallback
+        if type(obj) is int:
+            if INT_MIN <= obj <= INT_MAX:
+                return obj
+            return ormsgpack.Ext(EXT_BIGINT, str(obj).encode("ascii"))
+        if obj is None or type(obj) in (bool, float, bytes):
+            return obj
+        if type(obj) is str:
+            if len(obj) < DEDUP_MIN_LENGTH:
+                return obj
+            key = BlobStore.key(obj)
+            new_blobs[key] = obj
+            return ormsgpack.Ext(EXT_BLOB, key)
+        if type(obj) is list:
+            return [self._encode(item, new_blobs) for item in obj]
+        if type(obj) is dict:
+            return {key: self._encode(value, new_blobs) for key, value in obj.items()}
+        if type(obj) is tuple:
+            return ormsgpack.Ext(EXT_TUPLE, self._pack([self._encode(item, new_blobs) for item in obj]))
+        if isinstance(getattr(obj, "type", None), str) and MESSAGE_CLASSES.get(obj.type) is type(obj):
+            return ormsgpack.Ext(EXT_MESSAGE, self._pack([obj.type, self._message_fields(obj, new_blobs)]))
+        return ormsgpack.Ext(EXT_FALLBACK, self._pack(list(self.fallback.dumps_typed(obj))))
+
+    def _message_fields(self, message, new_blobs: Dict[bytes, str]) -> dict:
+        defaults = MESSAGE_DEFAULTS[message.type]
+        fields = {}
+        for name in type(message).model_fields:
+            value = getattr(message, name)
+            if name in defaults and value == defaults[name]:
+                continue
+            fields[name] = self._encode(value, new_blobs)
+        return fields
+
+    @staticmethod
+    def _pack(value) -> bytes:
+        return ormsgpack.packb(value, option=PACK_OPTIONS)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        new_blobs: Dict[bytes, str] = {}
+        try:
+            body = self._pack(self._encode(obj, new_blobs))
+        except ormsgpack.MsgpackEncodeError:
+            # Anything msgpack still rejects (e.g. a huge int as a dict key) is stored whole by the fallback
+            return self.fallback.dumps_typed(obj)
+        if new_blobs:
+            self.blobs.put_many(new_blobs)
+        return TYPE_NAME, compress(body)
+
+    # Decoding
+
+    def _ext(self, code: int, data: bytes) -> Any:
+        if code == EXT_BLOB:
+            return self.blobs.get(data)
+        if code == EXT_BIGINT:
+            return int(data)
+        value = ormsgpack.unpackb(data, ext_hook=self._ext, option=PACK_OPTIONS)
+        if code == EXT_TUPLE:
+            return tuple(value)
+        if code == EXT_MESSAGE:
+            type_, fields = value
+            # Every field supplied, so model_construct never falls back to get_default
+            defaults = {
+                name: copy(default) if isinstance(default, (dict, list)) else default
+                for name, default in MESSAGE_DEFAULTS[type_].items()
+                if name not in fields
+            }
+            return MESSAGE_CLASSES[type_].model_construct(**defaults, **fields)
+        if code == EXT_FALLBACK:
+            return self.fallback.loads_typed(tuple(value))
+        raise ValueError(f"unknown extension type {code} in compact payload")
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ != TYPE_NAME:
+            return self.fallback.loads_typed(data)
+        return ormsgpack.unpackb(decompress(payload), ext_hook=self._ext, option=PACK_OPTIONS)
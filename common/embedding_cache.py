@@ -0,0 +1,155 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Settings
+DEFAULT_MAX_ENTRIES = 50_000  # Least recently used vectors are evicted beyond this
+
+
+def content_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """Content-hash keyed, LRU-bounded cache in front of an embedding model.
+
+    Vectors are kept as float32 arrays. Misses inside one embed_documents call
+    are sent to the wrapped model as a single batch. Queries and documents
+    share cache entries, which is correct for symmetric models such as
+    all-MiniLM-L6-v2 that embed both the same way.
+
+    With persist_path set, the cache is written to ``<persist_path>.npy`` plus a
+    key file on exit and memory-mapped back in on the next start. The key file
+    records the model id and vector dimension; files written for another model
+    or dimension are ignored, and later overwritten on save.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        persist_path: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self.model_id = model_id or getattr(embeddings, "model_name", None) or type(embeddings).__name__
+        self.dimension: Optional[int] = None  # Known once a vector is loaded or computed
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        if persist_path:
+            self._load()
+            atexit.register(self.save)
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._vectors.get(key)
+        if vector is not None:
+            self._vectors.move_to_end(key)
+        return vector
+
+    def _put(self, key: str, vector: np.ndarray):
+        self._vectors[key] = vector
+        self._vectors.move_to_end(key)
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [content_key(text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = []
+        missing = {}
+
+        with self._lock:
+            for key, text in zip(keys, texts):
+                vector = self._get(key)
+                vectors.append(vector)
+                if vector is None:
+                    missing.setdefault(key, text)
+
+            self.hits += len(texts) - sum(vector is None for vector in vectors)
+            self.misses += len(missing)
+
+        if missing:
+            # One forward pass for every text this call has not seen before
+            computed = np.asarray(
+                self.embeddings.embed_documents(list(missing.values())), dtype=np.float32
+            )
+            with self._lock:
+                if self.dimension != computed.shape[1]:
+                    # Loaded vectors from a different model under the same id are useless
+                    self._vectors.clear()
+                    self.dimension = computed.shape[1]
+                for key, vector in zip(missing.keys(), computed):
+                    self._put(key, vector)
+            computed_by_key = dict(zip(missing.keys(), computed))
+            vectors = [
+                computed_by_key[key] if vector is None else vector
+                for key, vector in zip(keys, vectors)
+            ]
+
+        return [vector.tolist() for vector in vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts (e.g. a turn's user and assistant messages) in one call"""
+        return np.asarray(self.embed_documents(texts), dtype=np.float32)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._vectors),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _load(self):
+        matrix_path = f"{self.persist_path}.npy"
+        keys_path = f"{self.persist_path}.keys.json"
+        if not (os.path.exists(matrix_path) and os.path.exists(keys_path)):
+            return
+
+        with open(keys_path) as f:
+            header = json.load(f)
+
+        # Rows stay on disk until they are read
+        matrix = np.load(matrix_path, mmap_mode="r")
+        if (
+            not isinstance(header, dict)
+            or header.get("model") != self.model_id
+            or header.get("dimension") != matrix.shape[1]
+            or len(header.get("keys", ())) != matrix.shape[0]
+        ):
+            return
+        keys = header["keys"]
+        self.dimension = matrix.shape[1]
+        for key, row in zip(keys[-self.max_entries :], matrix[-self.max_entries :]):
+            self._vectors[key] = row
+
+    def save(self):
+        if not self.persist_path or not self._vectors:
+            return
+
+        with self._lock:
+            keys = list(self._vectors.keys())
+            matrix = np.stack([np.asarray(vector) for vector in self._vectors.values()])
+
+        # Write to temporary files first so a crash never leaves a torn cache
+        np.save(f"{self.persist_path}.tmp.npy", matrix.astype(np.float32))
+        with open(f"{self.persist_path}.keys.json.tmp", "w") as f:
+            json.dump({"model": self.model_id, "dimension": matrix.shape[1], "keys": keys}, f)
+        os.replace(f"{self.persist_path}.tmp.npy", f"{self.persist_path}.npy")
+        os.replace(f"{self.persist_path}.keys.json.tmp", f"{self.persist_path}.keys.json")
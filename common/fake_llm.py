@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class SlowFakeChatModel(BaseChatModel):
+    """Chat model stand-in for benchmarks: echoes the last message after a fixed delay.
+
+    When streamed, the reply arrives word by word: the first chunk after
+    latency seconds and each following one after token_latency seconds.
+    """
+
+    latency: float = 0.05  # Seconds spent "generating" each reply, or until the first streamed chunk
+    token_latency: float = 0.0  # Seconds between streamed chunks
+    response: Optional[str] = None  # Fixed reply instead of the echo
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake-chat-model"
+
+    def _content(self, messages: List[BaseMessage]) -> str:
+        if self.response is not None:
+            return self.response
+        content = messages[-1].content if messages else ""
+        return f"Echo: {content}"
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        message = AIMessage(content=self._content(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[str]:
+        words = self._content(messages).split(" ")
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency + self.token_latency * (len(self._chunks(messages)) - 1))
+        return self._reply(messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency + self.token_latency * (len(self._chunks(messages)) - 1))
+        return self._reply(messages)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        for i, text in enumerate(self._chunks(messages)):
+            time.sleep(self.latency if i == 0 else self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        for i, text in enumerate(self._chunks(messages)):
+            await asyncio.sleep(self.latency if i == 0 else self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
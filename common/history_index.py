@@ -0,0 +1,118 @@
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_THREAD = "default"
+
+
+class HistoryIndex:
+    """SQLite sidecar that orders chat messages stored in a vector collection.
+
+    Every message gets a monotonic sequence number within its thread, so the
+    most recent window and the entries to trim are read straight off the
+    (thread_id, seq) primary key instead of pulling and sorting the whole
+    collection.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS history (
+                thread_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                doc_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                PRIMARY KEY (thread_id, seq)
+            )"""
+        )
+        self._conn.commit()
+
+    def append(self, doc_id: str, role: str, thread_id: str = DEFAULT_THREAD) -> int:
+        """Record a stored message and return its sequence number"""
+        with self._lock:
+            (last_seq,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM history WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+            seq = last_seq + 1
+            self._conn.execute(
+                "INSERT INTO history VALUES (?, ?, ?, ?)", (thread_id, seq, doc_id, role)
+            )
+            self._conn.commit()
+        return seq
+
+    def extend(self, entries: Iterable[Tuple[str, str]], thread_id: str = DEFAULT_THREAD):
+        """Record (doc_id, role) pairs that are already in chronological order, in one transaction"""
+        entries = list(entries)
+        if not entries:
+            return
+        with self._lock:
+            (last_seq,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM history WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO history VALUES (?, ?, ?, ?)",
+                    [
+                        (thread_id, last_seq + offset, doc_id, role)
+                        for offset, (doc_id, role) in enumerate(entries, start=1)
+                    ],
+                )
+
+    def recent_ids(self, limit: int, thread_id: str = DEFAULT_THREAD) -> List[str]:
+        """Return the ids of the newest `limit` messages, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_id FROM history WHERE thread_id = ? ORDER BY seq DESC LIMIT ?",
+                (thread_id, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def trim(self, keep: int, thread_id: str = DEFAULT_THREAD) -> List[str]:
+        """Forget all but the newest `keep` messages and return the removed ids"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT seq FROM history WHERE thread_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?",
+                (thread_id, keep),
+            ).fetchone()
+            if row is None:
+                return []
+
+            cutoff = row[0]
+            removed = self._conn.execute(
+                "SELECT doc_id FROM history WHERE thread_id = ? AND seq <= ?",
+                (thread_id, cutoff),
+            ).fetchall()
+            self._conn.execute(
+                "DELETE FROM history WHERE thread_id = ? AND seq <= ?", (thread_id, cutoff)
+            )
+            self._conn.commit()
+        return [row[0] for row in removed]
+
+    def clear(self, thread_id: Optional[str] = None) -> List[str]:
+        """Forget one thread (or every thread) and return the removed ids"""
+        with self._lock:
+            if thread_id is None:
+                removed = self._conn.execute("SELECT doc_id FROM history").fetchall()
+                self._conn.execute("DELETE FROM history")
+            else:
+                removed = self._conn.execute(
+                    "SELECT doc_id FROM history WHERE thread_id = ?", (thread_id,)
+                ).fetchall()
+                self._conn.execute("DELETE FROM history WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+        return [row[0] for row in removed]
+
+    def count(self, thread_id: Optional[str] = None) -> int:
+        with self._lock:
+            if thread_id is None:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()
+            else:
+                (count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM history WHERE thread_id = ?", (thread_id,)
+                ).fetchone()
+        return count
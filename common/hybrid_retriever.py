@@ -0,0 +1,239 @@
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+
+from common.vector_index import document_vectors
+
+# Settings
+DEFAULT_K = 4  # Documents returned per query
+DEFAULT_FETCH_K = 20  # Candidates taken from each of BM25 and the dense index
+DEFAULT_RRF_K = 60  # Reciprocal rank fusion damping constant
+DEFAULT_LAMBDA_MULT = 0.5  # MMR trade-off: 1 is pure relevance, 0 is pure diversity
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_token_pattern = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; "₹800/session" becomes ["800", "session"]"""
+    return _token_pattern.findall(text.lower())
+
+
+def document_key(document: Document) -> str:
+    if document.id:
+        return document.id
+    return hashlib.sha1(document.page_content.encode("utf-8")).hexdigest()
+
+
+class BM25Index:
+    """In-process Okapi BM25 over an array-backed inverted index.
+
+    Postings are stored CSR-style: the postings of term t are
+    doc_ids[indptr[t]:indptr[t + 1]] with matching term_freqs, so scoring a
+    query is a few vectorized numpy operations per query term.
+    """
+
+    def __init__(self, texts: Sequence[str], k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+
+        term_ids, doc_ids, term_freqs = [], [], []
+        doc_lengths = np.zeros(len(texts), dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, count in counts.items():
+                term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                doc_ids.append(doc_id)
+                term_freqs.append(count)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind="stable")
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)[order]
+        self.term_freqs = np.asarray(term_freqs, dtype=np.float32)[order]
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(self.vocabulary)), out=self.indptr[1:])
+
+        self.doc_count = len(texts)
+        document_frequency = np.diff(self.indptr).astype(np.float32)
+        self.idf = np.log1p((self.doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        average_length = doc_lengths.mean() if self.doc_count else 1.0
+        # Per-document part of the BM25 denominator, computed once
+        self.length_norm = k1 * (1 - b + b * doc_lengths / max(average_length, 1e-9))
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(self.doc_count, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            docs = self.doc_ids[start:end]
+            freqs = self.term_freqs[start:end]
+            scores[docs] += self.idf[term_id] * freqs * (self.k1 + 1) / (freqs + self.length_norm[docs])
+        return scores
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Indices and scores of the k best matching documents, best first"""
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(i), float(scores[i])) for i in matched]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = DEFAULT_RRF_K
+) -> List[Tuple[str, float]]:
+    """Merge ranked key lists; each key scores sum(1 / (k + rank)) over the lists it is in"""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def mmr_select(
+    query_vector: np.ndarray,
+    candidate_vectors: np.ndarray,
+    k: int,
+    lambda_mult: float = DEFAULT_LAMBDA_MULT,
+    relevance: Optional[np.ndarray] = None,
+) -> List[int]:
+    """Maximal marginal relevance over a candidate matrix, returning candidate indices.
+
+    Relevance defaults to cosine similarity with the query; pass precomputed
+    scores (e.g. fused ranks) to use those instead. Pairwise similarities are
+    computed once as a matrix product, and each selection step is then a
+    single vectorized update of the running maximum similarity to the
+    already selected set.
+    """
+    if len(candidate_vectors) == 0:
+        return []
+
+    candidates = candidate_vectors / np.maximum(
+        np.linalg.norm(candidate_vectors, axis=1, keepdims=True), 1e-12
+    )
+    if relevance is None:
+        query = query_vector / max(np.linalg.norm(query_vector), 1e-12)
+        relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = pairwise[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(k, len(candidates)):
+        mmr = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, pairwise[best], out=max_similarity)
+    return selected
+
+
+class HybridRetriever(BaseRetriever):
+    """BM25 + dense retrieval merged with reciprocal rank fusion.
+
+    BM25 catches exact tokens the embedding model blurs, such as prices and
+    names; the dense index catches paraphrases. Each side contributes
+    fetch_k candidates, RRF merges the two rankings, and with use_mmr the
+    fused candidates are diversified with vectorized MMR before the top k are
+    returned. A drop-in for ``vector_store.as_retriever(...)``.
+
+    The query is embedded once and MMR reuses the candidate vectors stored
+    in the vector store. Both rankings key documents the same way: by id when
+    every BM25 document has one, otherwise by content hash, so a chunk found
+    by both sides is fused into one entry.
+    """
+
+    vector_store: VectorStore
+    documents: List[Document]
+    bm25: BM25Index
+    embeddings: Optional[Embeddings] = None
+    k: int = DEFAULT_K
+    fetch_k: int = DEFAULT_FETCH_K
+    rrf_k: int = DEFAULT_RRF_K
+    use_mmr: bool = True
+    lambda_mult: float = DEFAULT_LAMBDA_MULT
+    key_by_id: bool = True
+
+    @classmethod
+    def from_documents(
+        cls, documents: List[Document], vector_store: VectorStore, **kwargs
+    ) -> "HybridRetriever":
+        bm25 = BM25Index([document.page_content for document in documents])
+        kwargs.setdefault("embeddings", vector_store.embeddings)
+        kwargs.setdefault("key_by_id", all(document.id for document in documents))
+        return cls(vector_store=vector_store, documents=documents, bm25=bm25, **kwargs)
+
+    @classmethod
+    def from_vector_store(cls, vector_store, **kwargs) -> "HybridRetriever":
+        """Build the BM25 side from every document already in a Chroma store"""
+        stored = vector_store.get(include=["documents", "metadatas"])
+        documents = [
+            Document(id=id_, page_content=text, metadata=metadata or {})
+            for id_, text, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        ]
+        return cls.from_documents(documents, vector_store, **kwargs)
+
+    def _key(self, document: Document) -> str:
+        if self.key_by_id:
+            return document_key(document)
+        return hashlib.sha1(document.page_content.encode("utf-8")).hexdigest()
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        by_key: Dict[str, Document] = {}
+
+        sparse_ranking = []
+        for index, _ in self.bm25.search(query, self.fetch_k):
+            document = self.documents[index]
+            key = self._key(document)
+            by_key[key] = document
+            sparse_ranking.append(key)
+
+        query_vector = None
+        if self.embeddings is not None:
+            query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            dense = self.vector_store.similarity_search_by_vector(query_vector.tolist(), k=self.fetch_k)
+        else:
+            dense = self.vector_store.similarity_search(query, k=self.fetch_k)
+
+        dense_ranking = []
+        for document in dense:
+            key = self._key(document)
+            # Prefer the stored copy, whose id finds its vector for MMR
+            if key not in by_key or not by_key[key].id:
+                by_key[key] = document
+            dense_ranking.append(key)
+
+        fused = reciprocal_rank_fusion([sparse_ranking, dense_ranking], self.rrf_k)[: self.fetch_k]
+        candidates = [by_key[key] for key, _ in fused]
+
+        if not self.use_mmr or query_vector is None or len(candidates) <= self.k:
+            return candidates[: self.k]
+
+        vectors = document_vectors(self.embeddings, candidates, self.vector_store)
+        # Fused scores as relevance, so exact BM25 matches are not lost to diversity
+        scores = np.asarray([score for _, score in fused], dtype=np.float32)
+        selected = mmr_select(query_vector, vectors, self.k, self.lambda_mult, scores / scores.max())
+        return [candidates[i] for i in selected]
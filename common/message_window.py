@@ -0,0 +1,67 @@
+"""Sliding message window for chatbots whose state uses the add_messages reducer.
+
+Slicing state["messages"] inside a node only limits what the LLM sees; the
+checkpointed history keeps growing, and every turn loads and saves all of it.
+trim_window returns RemoveMessage deltas for the turns that fell out of the
+window, so the persisted state stays at most window_size exchanges long.
+Evicted turns can optionally be folded into a rolling summary, kept in its
+own state field and put in front of the window when calling the LLM.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage
+
+# Settings
+DEFAULT_WINDOW_SIZE = 3  # Exchanges (user message and everything up to the next one) kept
+
+SUMMARY_PROMPT = (
+    "Extend the summary of the conversation so far with the new messages below. "
+    "Keep names, facts and decisions; drop small talk. Reply with the summary only.\n\n"
+    "Summary so far:\n{summary}\n\nNew messages:\n{messages}"
+)
+
+
+def split_window(
+    messages: Sequence[BaseMessage], window_size: int = DEFAULT_WINDOW_SIZE
+) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+    """(evicted, kept), cutting only in front of a user message so tool calls stay with their results"""
+    starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if len(starts) <= window_size:
+        return [], list(messages)
+    cut = starts[-window_size]
+    return list(messages[:cut]), list(messages[cut:])
+
+
+def trim_window(
+    messages: Sequence[BaseMessage], window_size: int = DEFAULT_WINDOW_SIZE
+) -> Tuple[List[RemoveMessage], List[BaseMessage], List[BaseMessage]]:
+    """(removals to return from the node, evicted messages, messages still in the window)"""
+    evicted, kept = split_window(messages, window_size)
+    return [RemoveMessage(id=message.id) for message in evicted], evicted, kept
+
+
+def _summary_request(summary: str, evicted: Sequence[BaseMessage]) -> List[BaseMessage]:
+    lines = "\n".join(f"{message.type}: {message.content}" for message in evicted if message.content)
+    return [HumanMessage(content=SUMMARY_PROMPT.format(summary=summary or "(none)", messages=lines))]
+
+
+def update_summary(llm, summary: str, evicted: Sequence[BaseMessage]) -> str:
+    """Fold the evicted messages into the rolling summary"""
+    if not evicted:
+        return summary
+    return llm.invoke(_summary_request(summary, evicted)).content
+
+
+async def aupdate_summary(llm, summary: str, evicted: Sequence[BaseMessage]) -> str:
+    """Async version of update_summary"""
+    if not evicted:
+        return summary
+    return (await llm.ainvoke(_summary_request(summary, evicted))).content
+
+
+def with_summary(summary: Optional[str], messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """Messages to send to the LLM: the summary, if any, followed by the window"""
+    if not summary:
+        return list(messages)
+    return [SystemMessage(content=f"Summary of the earlier conversation: {summary}"), *messages]
@@ -0,0 +1,81 @@
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from common.vector_index import document_vectors
+
+# Settings
+DEFAULT_ACCEPT_THRESHOLD = 0.55  # Cosine similarity above which a document is kept without grading
+DEFAULT_REJECT_THRESHOLD = 0.15  # Cosine similarity below which a document is dropped without grading
+
+ACCEPT = "accept"
+REJECT = "reject"
+GRADE = "grade"
+
+
+class SimilarityPrefilter:
+    """Decides clear-cut document relevance locally before any LLM grading.
+
+    Documents are scored by cosine similarity to the question in one vectorized
+    step. Only the ambiguous band between the two thresholds is left for the
+    LLM grader. With vector_store set, document vectors are read back from
+    the store that returned them, so only the question is embedded; documents
+    the store does not hold are embedded as a fallback.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        accept_threshold: float = DEFAULT_ACCEPT_THRESHOLD,
+        reject_threshold: float = DEFAULT_REJECT_THRESHOLD,
+        vector_store=None,
+    ):
+        if reject_threshold > accept_threshold:
+            raise ValueError("reject_threshold must not be above accept_threshold")
+
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.accept_threshold = accept_threshold
+        self.reject_threshold = reject_threshold
+        self.accepted = 0
+        self.rejected = 0
+        self.graded = 0
+
+    def scores(self, question: str, documents: List[Document]) -> np.ndarray:
+        if not documents:
+            return np.zeros(0, dtype=np.float32)
+
+        query = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        matrix = document_vectors(self.embeddings, documents, self.vector_store)
+
+        query /= np.linalg.norm(query) or 1.0
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        return matrix @ query
+
+    def classify(self, question: str, documents: List[Document]) -> List[str]:
+        """Return ACCEPT, REJECT or GRADE for each document, in order"""
+        scores = self.scores(question, documents)
+        decisions = np.where(
+            scores >= self.accept_threshold,
+            ACCEPT,
+            np.where(scores <= self.reject_threshold, REJECT, GRADE),
+        ).tolist()
+
+        self.accepted += decisions.count(ACCEPT)
+        self.rejected += decisions.count(REJECT)
+        self.graded += decisions.count(GRADE)
+        return decisions
+
+    def stats(self) -> dict:
+        total = self.accepted + self.rejected + self.graded
+        avoided = self.accepted + self.rejected
+        return {
+            "documents": total,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "llm_grading_calls": self.graded,
+            "llm_grading_calls_avoided": avoided,
+            "avoided_rate": avoided / total if total else 0.0,
+        }
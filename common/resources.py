@@ -0,0 +1,104 @@
+"""Lazy, process-wide singletons for expensive resources.
+
+Embedding models, vector store clients and LLM clients are built on first use
+and then shared by every graph in the process. Heavy libraries are imported
+inside the getters, so importing a graph module does not load them.
+"""
+
+import functools
+import inspect
+import threading
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+_lock = threading.RLock()
+
+
+def lazy_resource(factory: Callable[..., T]) -> Callable[..., T]:
+    """Memoize a factory so each distinct set of arguments is built exactly once"""
+    instances = {}
+    signature = inspect.signature(factory)
+
+    @functools.wraps(factory)
+    def get(*args, **kwargs) -> T:
+        # get_embeddings() and get_embeddings(DEFAULT_EMBEDDING_MODEL) share one instance
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())
+        if key not in instances:
+            with _lock:
+                if key not in instances:
+                    instances[key] = factory(*args, **kwargs)
+        return instances[key]
+
+    get.cache_clear = instances.clear
+    return get
+
+
+@lazy_resource
+def get_embedding_model(model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """The sentence-transformer itself, loaded once per model name"""
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(model_name=model_name)
+
+
+@lazy_resource
+def get_embeddings(model_name: str = DEFAULT_EMBEDDING_MODEL, persist_path: Optional[str] = None):
+    """Shared model behind a content-hash cache; each persist_path gets its own cache, not its own model"""
+    from common.embedding_cache import CachedEmbeddings
+
+    return CachedEmbeddings(get_embedding_model(model_name), persist_path=persist_path, model_id=model_name)
+
+
+@lazy_resource
+def get_chroma_client(path: Optional[str] = None):
+    import chromadb
+
+    if path is None:
+        return chromadb.EphemeralClient()
+    return chromadb.PersistentClient(path=path)
+
+
+@lazy_resource
+def get_vector_store(
+    collection_name: str,
+    path: Optional[str] = None,
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    embeddings_path: Optional[str] = None,
+):
+    from langchain_chroma import Chroma
+
+    return Chroma(
+        client=get_chroma_client(path),
+        collection_name=collection_name,
+        embedding_function=get_embeddings(model_name, embeddings_path),
+    )
+
+
+@lazy_resource
+def get_chat_model(provider: str, model: str):
+    """Shared chat model client; provider is "anthropic", "groq" or "google" """
+    if provider == "anthropic":
+        from langchain_anthropic import ChatAnthropic
+
+        return ChatAnthropic(model=model)
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+
+        return ChatGroq(model_name=model)
+    if provider == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(model=model)
+    raise ValueError(f"Unknown chat model provider: {provider}")
+
+
+@lazy_resource
+def get_react_prompt():
+    from common.prompts import react_prompt
+
+    return react_prompt()
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core.tools import BaseTool
+
+# Settings
+DEFAULT_CACHE_PATH = os.getenv(
+    "SEARCH_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_cache.sqlite"),
+)
+DEFAULT_TTL = 24 * 60 * 60  # Seconds before a cached result is searched again
+DEFAULT_MAX_ENTRIES = 10_000  # Least recently used results are evicted beyond this
+
+
+def normalize_query(query: str) -> str:
+    """Collapse case and whitespace so trivially different queries share a key"""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def cache_namespace(tool: BaseTool) -> str:
+    """Tool name plus a hash of its result-shaping settings (max_results, search_depth, ...)
+
+    Every JSON-serializable field the tool adds to BaseTool counts, so two
+    instances of one tool configured differently never share cached results.
+    Unset (None) fields, clients and secrets are left out.
+    """
+    settings = {}
+    for field in sorted(type(tool).model_fields):
+        if field in BaseTool.model_fields:
+            continue
+        value = getattr(tool, field)
+        if value is None:
+            continue
+        try:
+            settings[field] = json.dumps(value, sort_keys=True)
+        except TypeError:
+            continue
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return f"{tool.name}:{digest}"
+
+
+class SearchCache:
+    """Disk-backed search result cache with TTL expiry and an LRU size bound"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS search_cache_lru ON search_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def _key(self, namespace: str, query: str) -> str:
+        return f"{namespace}:{normalize_query(query)}"
+
+    def get(self, namespace: str, query: str) -> Optional[Any]:
+        """Return the cached result, or None on a miss or expired entry"""
+        key = self._key(namespace, query)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            result, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(result)
+
+    def set(self, namespace: str, query: str, result: Any):
+        """Store a result and evict the least recently used entries over the bound"""
+        key = self._key(namespace, query)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, json.dumps(result), now, now),
+            )
+
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    """DELETE FROM search_cache WHERE key IN (
+                        SELECT key FROM search_cache ORDER BY last_access LIMIT ?
+                    )""",
+                    (excess,),
+                )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class CachedSearchTool(BaseTool):
+    """Wraps a search tool so repeated queries are answered from a SearchCache.
+
+    The wrapper keeps the wrapped tool's name, description and argument schema,
+    so it can be bound to an LLM or passed to ToolNode in its place. Results
+    are keyed by cache_namespace(tool) and the query. The async path runs the
+    SQLite calls in a worker thread so the event loop never waits on the disk.
+    """
+
+    tool: BaseTool
+    cache: SearchCache
+    namespace: str
+
+    def _store(self, query: str, result: Any):
+        # Search tools report failures as plain strings, which must not be cached
+        if not isinstance(result, str):
+            self.cache.set(self.namespace, query, result)
+
+    def _run(self, query: str, **kwargs) -> Any:
+        result = self.cache.get(self.namespace, query)
+        if result is None:
+            result = self.tool.invoke(query)
+            self._store(query, result)
+        return result
+
+    async def _arun(self, query: str, **kwargs) -> Any:
+        result = await asyncio.to_thread(self.cache.get, self.namespace, query)
+        if result is None:
+            result = await self.tool.ainvoke(query)
+            await asyncio.to_thread(self._store, query, result)
+        return result
+
+
+_shared_cache: Optional[SearchCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide cache shared by every wrapped search tool"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache()
+    return _shared_cache
+
+
+def cached_search_tool(tool: BaseTool, cache: Optional[SearchCache] = None) -> CachedSearchTool:
+    return CachedSearchTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        tool=tool,
+        cache=cache or get_search_cache(),
+        namespace=cache_namespace(tool),
+    )
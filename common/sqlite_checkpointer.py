@@ -0,0 +1,573 @@
+"""SQLite checkpointer that stores list channels as deltas and group-commits writes.
+
+The stock SqliteSaver writes every changed channel in full, so a thread's
+``messages`` list is re-serialized on every step and the database grows
+quadratically with conversation length. DeltaSqliteSaver stores a list
+channel as only the items appended since its previous version, with a full
+snapshot every snapshot_interval versions to bound the read-side chain.
+
+All writes go through one writer thread that commits whatever has queued up
+in a single transaction (group commit), so concurrent conversations share
+fsyncs. Reads use a pool of WAL-mode connections.
+"""
+
+import asyncio
+import queue
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+# Settings
+DEFAULT_POOL_SIZE = 8  # Reader connections
+DEFAULT_SNAPSHOT_INTERVAL = 50  # Deltas in a row before a full snapshot is written
+DEFAULT_MAX_BATCH = 512  # Write requests committed in one transaction at most
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024  # Serialized size of the latest list values kept for delta detection
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+EMPTY = "empty"
+MISSING = object()  # A channel with no stored value, as opposed to a stored None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    base_version TEXT,
+    type TEXT,
+    payload BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+# (sql, rows) pairs executed with executemany inside one transaction
+Statements = List[Tuple[str, List[tuple]]]
+
+
+class MissingBlobError(LookupError):
+    """A delta's base version is gone, so the channel value cannot be rebuilt"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Durable at each WAL checkpoint rather than each commit; safe against crashes in WAL mode
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def extends(previous: Sequence, value: list) -> bool:
+    """True when value is previous with zero or more items appended"""
+    if len(value) < len(previous):
+        return False
+    return all(old is new or old == new for old, new in zip(previous, value))
+
+
+class GroupCommitWriter(threading.Thread):
+    """Single writer thread that commits every queued request in one transaction"""
+
+    def __init__(self, path: str, max_batch: int = DEFAULT_MAX_BATCH):
+        super().__init__(name="checkpoint-writer", daemon=True)
+        self.path = path
+        self.max_batch = max_batch
+        self.transactions = 0
+        self.requests = 0
+        self._queue: "queue.Queue[Optional[Tuple[Statements, Future]]]" = queue.Queue()
+
+    def submit(self, statements: Statements) -> Future:
+        future: Future = Future()
+        self._queue.put((statements, future))
+        return future
+
+    def stop(self):
+        self._queue.put(None)
+        self.join()
+
+    def _commit(self, conn: sqlite3.Connection, batch):
+        with conn:
+            for statements, _ in batch:
+                for sql, rows in statements:
+                    conn.executemany(sql, rows)
+
+    def run(self):
+        conn = connect(self.path)
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._commit(conn, batch)
+                self.transactions += 1
+                self.requests += len(batch)
+                for _, future in batch:
+                    future.set_result(None)
+            except Exception:
+                # One bad request must not fail the others it was batched with
+                for request in batch:
+                    try:
+                        self._commit(conn, [request])
+                        request[1].set_result(None)
+                    except Exception as error:
+                        request[1].set_exception(error)
+        conn.close()
+
+
+class DeltaSqliteSaver(BaseCheckpointSaver):
+    """Checkpointer storing list channels as appended-item deltas over periodic snapshots"""
+
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self.cache_bytes = cache_bytes
+
+        setup = connect(path)
+        setup.executescript(SCHEMA)
+        setup.close()
+
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(connect(path))
+
+        self.writer = GroupCommitWriter(path, max_batch)
+        self.writer.start()
+
+        # (thread_id, checkpoint_ns, channel) -> (version, items, deltas since snapshot, serialized size)
+        self._latest: "OrderedDict[tuple, Tuple[str, tuple, int, int]]" = OrderedDict()
+        self._latest_bytes = 0
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    @contextmanager
+    def from_conn_string(cls, path: str, **kwargs) -> Iterator["DeltaSqliteSaver"]:
+        saver = cls(path, **kwargs)
+        try:
+            yield saver
+        finally:
+            saver.close()
+
+    def close(self):
+        self.writer.stop()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def stats(self) -> dict:
+        return {
+            "write_requests": self.writer.requests,
+            "transactions": self.writer.transactions,
+            "requests_per_transaction": self.writer.requests / self.writer.transactions
+            if self.writer.transactions
+            else 0.0,
+        }
+
+    # Writing
+
+    def _blob_rows(self, thread_id: str, checkpoint_ns: str, values: dict, new_versions: ChannelVersions):
+        """Blob rows to write, and the list values to cache as delta bases once they are committed"""
+        rows, cache_entries = [], []
+        for channel, version in new_versions.items():
+            key = (thread_id, checkpoint_ns, channel)
+            version = str(version)
+            if channel not in values:
+                rows.append((thread_id, checkpoint_ns, channel, version, EMPTY, None, None, None))
+                with self._cache_lock:
+                    self._forget(key)
+                continue
+
+            value = values[channel]
+            with self._cache_lock:
+                previous = self._latest.get(key)
+            if previous is not None and previous[0] == version:
+                # Already stored (e.g. a spill passing every channel version); a delta
+                # against itself would replace it with a row that points at itself
+                continue
+
+            if (
+                isinstance(value, list)
+                and previous is not None
+                and previous[2] < self.snapshot_interval
+                and extends(previous[1], value)
+            ):
+                type_, payload = self.serde.dumps_typed(value[len(previous[1]) :])
+                rows.append((thread_id, checkpoint_ns, channel, version, DELTA, previous[0], type_, payload))
+                deltas = previous[2] + 1
+                size = previous[3] + len(payload)
+            else:
+                type_, payload = self.serde.dumps_typed(value)
+                rows.append((thread_id, checkpoint_ns, channel, version, SNAPSHOT, None, type_, payload))
+                deltas = 0
+                size = len(payload)
+
+            # Until the commit succeeds no delta may build on either version
+            with self._cache_lock:
+                self._forget(key)
+            if isinstance(value, list) and size <= self.cache_bytes:
+                # A tuple copy, so in-place edits of the live list cannot fake a prefix
+                cache_entries.append((key, (version, tuple(value), deltas, size)))
+        return rows, cache_entries
+
+    def _remember(self, cache_entries: list):
+        """Cache committed list values as delta bases"""
+        with self._cache_lock:
+            for key, entry in cache_entries:
+                self._forget(key)
+                self._latest[key] = entry
+                self._latest_bytes += entry[3]
+            while self._latest_bytes > self.cache_bytes:
+                self._latest_bytes -= self._latest.popitem(last=False)[1][3]
+
+    def _forget(self, key: tuple):
+        """Drop a cached list value; caller holds _cache_lock"""
+        entry = self._latest.pop(key, None)
+        if entry is not None:
+            self._latest_bytes -= entry[3]
+
+    def _put_statements(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> Tuple[Statements, RunnableConfig, list]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+
+        blob_rows, cache_entries = self._blob_rows(
+            thread_id, checkpoint_ns, checkpoint["channel_values"], new_versions
+        )
+        type_, serialized = self.serde.dumps_typed({**checkpoint, "channel_values": {}})
+        metadata_type, serialized_metadata = self.serde.dumps_typed(dict(metadata))
+
+        statements = [
+            ("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", blob_rows),
+            (
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        configurable.get("checkpoint_id"),
+                        type_,
+                        serialized,
+                        metadata_type,
+                        serialized_metadata,
+                    )
+                ],
+            ),
+        ]
+        next_config = {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+        return statements, next_config, cache_entries
+
+    def _writes_statements(
+        self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str
+    ) -> Statements:
+        configurable = config["configurable"]
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        sql = f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        rows = [
+            (
+                configurable["thread_id"],
+                configurable.get("checkpoint_ns", ""),
+                configurable["checkpoint_id"],
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        return [(sql, rows)]
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        statements, next_config, cache_entries = self._put_statements(
+            config, checkpoint, metadata, new_versions
+        )
+        self.writer.submit(statements).result()
+        self._remember(cache_entries)
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.writer.submit(self._writes_statements(config, writes, task_id, task_path)).result()
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        # Serializing (and CompactSerializer's blob inserts) runs off the event loop
+        statements, next_config, cache_entries = await asyncio.to_thread(
+            self._put_statements, config, checkpoint, metadata, new_versions
+        )
+        await asyncio.wrap_future(self.writer.submit(statements))
+        self._remember(cache_entries)
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        statements = await asyncio.to_thread(self._writes_statements, config, writes, task_id, task_path)
+        await asyncio.wrap_future(self.writer.submit(statements))
+
+    def delete_thread(self, thread_id: str) -> None:
+        rows = [(thread_id,)]
+        self.writer.submit(
+            [(f"DELETE FROM {table} WHERE thread_id = ?", rows) for table in ["checkpoints", "blobs", "writes"]]
+        ).result()
+        with self._cache_lock:
+            for key in [key for key in self._latest if key[0] == thread_id]:
+                self._forget(key)
+
+    # Reading
+
+    def _load_value(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str, channel: str, version: str):
+        """Rebuild a channel value from its snapshot plus the deltas after it; MISSING if empty.
+
+        A stored None is a real value (trigger channels such as branch:to:<node> hold
+        None) and is returned as such.
+        """
+        deltas = []
+        while True:
+            row = conn.execute(
+                "SELECT kind, base_version, type, payload FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+            if row is None and deltas:
+                raise MissingBlobError(
+                    f"base version {version} of channel {channel!r} in thread {thread_id!r} is missing"
+                )
+            if row is None or row[0] == EMPTY:
+                return MISSING
+            kind, base_version, type_, payload = row
+            value = self.serde.loads_typed((type_, payload))
+            if kind == SNAPSHOT:
+                break
+            deltas.append(value)
+            version = base_version
+
+        if deltas:
+            value = list(value)
+            for delta in reversed(deltas):
+                value.extend(delta)
+        return value
+
+    def _tuple(self, conn: sqlite3.Connection, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, serialized, metadata_type, metadata = row
+        checkpoint = self.serde.loads_typed((type_, serialized))
+
+        channel_values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            value = self._load_value(conn, thread_id, checkpoint_ns, channel, str(version))
+            if value is not MISSING:
+                channel_values[channel] = value
+        checkpoint["channel_values"] = channel_values
+
+        pending_writes = [
+            (task_id, channel, self.serde.loads_typed((write_type, value)))
+            for task_id, channel, write_type, value in conn.execute(
+                "SELECT task_id, channel, type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+        ]
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=checkpoint,
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_id,
+                }
+            }
+            if parent_id
+            else None,
+            pending_writes=pending_writes,
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        with self._reader() as conn:
+            if checkpoint_id:
+                row = conn.execute(
+                    "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._tuple(conn, row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        conditions, params = [], []
+        if config:
+            conditions.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                conditions.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                conditions.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            conditions.append("checkpoint_id < ?")
+            params.append(before_id)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        tuples = []
+        # Decoded before yielding so a slow consumer never holds a pooled connection
+        with self._reader() as conn:
+            rows = conn.execute(f"SELECT * FROM checkpoints {where} ORDER BY checkpoint_id DESC", params)
+            for row in rows:
+                if filter:
+                    metadata = self.serde.loads_typed((row[6], row[7]))
+                    if any(metadata.get(key) != value for key, value in filter.items()):
+                        continue
+                tuples.append(self._tuple(conn, row))
+                if limit is not None and len(tuples) >= limit:
+                    break
+        yield from tuples
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
@@ -0,0 +1,176 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from common.search_cache import normalize_query
+
+# Settings
+# Cosine similarities to a topic centroid (the normalized mean of its examples).
+# Tuned for all-MiniLM-L6-v2, where paraphrases of an example score well above
+# 0.5 and unrelated sentences score around 0.0-0.2. A question below
+# DEFAULT_MIN_SIMILARITY looks like none of the examples, and one whose on- and
+# off-topic scores are within DEFAULT_MARGIN sits on the boundary; both go to
+# the LLM. Raising either sends more questions to the LLM and makes fewer local
+# mistakes. Retune both for any other embedding model.
+DEFAULT_MIN_SIMILARITY = 0.35  # Nearest centroid must be at least this close to answer locally
+DEFAULT_MARGIN = 0.08  # Required gap between the best on-topic and off-topic centroids
+DEFAULT_CACHE_SIZE = 10_000  # Least recently used answers are evicted beyond this
+
+OFF_TOPIC = "off_topic"
+
+# A few example questions per topic; each topic's centroid is their mean vector
+GYM_TOPICS: Dict[str, List[str]] = {
+    "hours": [
+        "What are the gym's opening hours?",
+        "Is the gym open on weekends?",
+        "What time does the gym close?",
+        "Are you open on holidays?",
+    ],
+    "membership": [
+        "How much does a membership cost?",
+        "What membership plans do you offer?",
+        "Is there a student discount?",
+        "What does the premium plan include?",
+    ],
+    "classes": [
+        "What fitness classes do you have?",
+        "When are the beginner yoga classes?",
+        "Do you offer HIIT or Zumba?",
+        "Where can I see the class schedule?",
+    ],
+    "trainers": [
+        "Do you have personal trainers?",
+        "How much is a personal training session?",
+        "Who is the head trainer?",
+        "Are the trainers certified?",
+    ],
+    "facilities": [
+        "Does the gym have a swimming pool?",
+        "What equipment does the gym have?",
+        "Is there a sauna or steam room?",
+        "Are there lockers and showers?",
+    ],
+    "history": [
+        "Who founded the gym?",
+        "When was the gym founded?",
+        "Who is the owner of the gym?",
+        "How big is the gym?",
+    ],
+    OFF_TOPIC: [
+        "Who is the owner of Apple?",
+        "What is the capital of France?",
+        "What's the weather like today?",
+        "Write me a poem about the sea.",
+        "How do I fix a bug in my Python code?",
+        "What is the latest iPhone model?",
+    ],
+}
+
+
+class TopicClassifier:
+    """Yes/No gym-topic classifier that avoids the LLM whenever it can.
+
+    Answers come from, in order: a normalized-question cache, a nearest-centroid
+    classifier over sentence embeddings of example questions, and finally the
+    LLM fallback for questions the centroids are not confident about.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        fallback: Callable[[str], str],
+        topics: Optional[Dict[str, List[str]]] = None,
+        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+        margin: float = DEFAULT_MARGIN,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.embeddings = embeddings
+        self.fallback = fallback
+        self.topics = topics or GYM_TOPICS
+        self.min_similarity = min_similarity
+        self.margin = margin
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.local_answers = 0
+        self.llm_answers = 0
+
+        self._lock = threading.Lock()
+        self._centroid_lock = threading.Lock()  # Concurrent first questions embed the examples once
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._labels: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+
+    def _normalize(self, matrix: np.ndarray) -> np.ndarray:
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=-1, keepdims=True), 1e-12)
+
+    def _build_centroids(self):
+        with self._centroid_lock:
+            if self._centroids is not None:
+                return
+            self._labels, self._centroids = self._compute_centroids()
+
+    def _compute_centroids(self):
+        labels, centroids = [], []
+        for label, examples in self.topics.items():
+            vectors = self._normalize(
+                np.asarray(self.embeddings.embed_documents(examples), dtype=np.float32)
+            )
+            labels.append(label)
+            centroids.append(vectors.mean(axis=0))
+        return labels, self._normalize(np.stack(centroids))
+
+    def classify_locally(self, question: str) -> Optional[str]:
+        """Return "Yes"/"No" when the centroids are confident, otherwise None"""
+        if self._centroids is None:
+            self._build_centroids()
+
+        query = self._normalize(
+            np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        )
+        similarities = self._centroids @ query
+
+        off_topic_index = self._labels.index(OFF_TOPIC)
+        off_topic_similarity = similarities[off_topic_index]
+        on_topic_similarity = np.delete(similarities, off_topic_index).max()
+
+        if max(on_topic_similarity, off_topic_similarity) < self.min_similarity:
+            return None
+        if on_topic_similarity - off_topic_similarity >= self.margin:
+            return "Yes"
+        if off_topic_similarity - on_topic_similarity >= self.margin:
+            return "No"
+        return None
+
+    def classify(self, question: str) -> str:
+        key = normalize_query(question)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+
+        answer = self.classify_locally(question)
+        if answer is not None:
+            self.local_answers += 1
+        else:
+            answer = self.fallback(question)
+            self.llm_answers += 1
+
+        with self._lock:
+            self._cache[key] = answer
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return answer
+
+    def stats(self) -> dict:
+        total = self.cache_hits + self.local_answers + self.llm_answers
+        return {
+            "cache_hits": self.cache_hits,
+            "local_answers": self.local_answers,
+            "llm_answers": self.llm_answers,
+            "llm_avoided_rate": (total - self.llm_answers) / total if total else 0.0,
+        }
@@ -0,0 +1,239 @@
+"""Persistent, versioned vector index built from a directory of source documents.
+
+build_index chunks every source file, embeds the chunks in batches and writes
+them to a persistent Chroma collection together with a manifest of content
+hashes. Rerunning it only re-embeds files whose content changed, and drops
+chunks of files that were removed. The query graphs call open_index, which
+opens the existing collection without embedding anything, and
+document_vectors hands the stored chunk vectors to the code that scores
+retrieved documents, so they are not embedded a second time.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from common.resources import DEFAULT_EMBEDDING_MODEL, get_chroma_client, get_embeddings
+
+# Settings
+DEFAULT_COLLECTION = "gym_knowledge_base"
+DEFAULT_CHUNK_SIZE = 1000  # Characters per chunk
+DEFAULT_CHUNK_OVERLAP = 100  # Characters shared by neighbouring chunks
+EMBED_BATCH_SIZE = 256  # Chunks per embedding call
+SOURCE_EXTENSIONS = (".txt", ".md")
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+
+class IndexNotBuiltError(RuntimeError):
+    pass
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def chunk_text(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_CHUNK_OVERLAP) -> List[str]:
+    """Split text into chunks of at most chunk_size characters, preferring paragraph and word breaks"""
+    text = text.strip()
+    if len(text) <= chunk_size:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            # Back off to the nearest paragraph break, then the nearest space
+            for separator in ["\n\n", "\n", " "]:
+                cut = text.rfind(separator, start + overlap + 1, end)
+                if cut != -1:
+                    end = cut
+                    break
+        chunks.append(text[start:end].strip())
+        if end == len(text):
+            break
+        next_start = max(end - overlap, start + 1)
+        # Start the overlap on a word boundary
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+    return [chunk for chunk in chunks if chunk]
+
+
+def read_sources(source_dir: str) -> Dict[str, str]:
+    """Map each source file's path relative to source_dir to its text"""
+    sources = {}
+    for root, _, files in os.walk(source_dir):
+        for name in sorted(files):
+            if not name.endswith(SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, encoding="utf-8") as f:
+                sources[os.path.relpath(path, source_dir)] = f.read()
+    return sources
+
+
+def load_manifest(persist_dir: str) -> Optional[dict]:
+    path = os.path.join(persist_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(persist_dir: str, manifest: dict):
+    path = os.path.join(persist_dir, MANIFEST_NAME)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def build_index(
+    source_dir: str,
+    persist_dir: str,
+    collection_name: str = DEFAULT_COLLECTION,
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    rebuild: bool = False,
+) -> dict:
+    """Bring the index in persist_dir up to date with source_dir and return what changed"""
+    os.makedirs(persist_dir, exist_ok=True)
+    client = get_chroma_client(persist_dir)
+    embeddings = get_embeddings(model_name)
+
+    settings = {
+        "collection": collection_name,
+        "embedding_model": model_name,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+    }
+    manifest = load_manifest(persist_dir)
+    if (
+        rebuild
+        or manifest is None
+        or manifest.get("format") != MANIFEST_FORMAT
+        or manifest.get("settings") != settings
+    ):
+        # Chunks from other settings or another model cannot be mixed in
+        existing = {getattr(c, "name", c) for c in client.list_collections()}
+        if collection_name in existing:
+            client.delete_collection(collection_name)
+        previous_version = manifest.get("version", 0) if manifest else 0
+        manifest = {"format": MANIFEST_FORMAT, "version": previous_version, "settings": settings, "sources": {}}
+
+    collection = client.get_or_create_collection(collection_name, metadata={"hnsw:space": "cosine"})
+    indexed: Dict[str, dict] = manifest["sources"]
+    sources = read_sources(source_dir)
+
+    changed = {
+        source: text
+        for source, text in sources.items()
+        if indexed.get(source, {}).get("hash") != content_hash(text)
+    }
+    removed = [source for source in indexed if source not in sources]
+
+    for source in removed + list(changed):
+        if source in indexed:
+            collection.delete(where={"source": source})
+            indexed.pop(source)
+
+    ids, texts, metadatas = [], [], []
+    for source, text in changed.items():
+        source_hash = content_hash(text)
+        chunks = chunk_text(text, chunk_size, chunk_overlap)
+        for i, chunk in enumerate(chunks):
+            ids.append(f"{source}:{i}")
+            texts.append(chunk)
+            metadatas.append({"source": source, "source_hash": source_hash, "chunk": i})
+        indexed[source] = {"hash": source_hash, "chunks": len(chunks)}
+
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        end = start + EMBED_BATCH_SIZE
+        collection.upsert(
+            ids=ids[start:end],
+            documents=texts[start:end],
+            metadatas=metadatas[start:end],
+            embeddings=embeddings.embed_documents(texts[start:end]),
+        )
+
+    if changed or removed:
+        manifest["version"] += 1
+    save_manifest(persist_dir, manifest)
+
+    return {
+        "version": manifest["version"],
+        "sources": len(sources),
+        "changed": len(changed),
+        "removed": len(removed),
+        "unchanged": len(sources) - len(changed),
+        "chunks_embedded": len(texts),
+        "chunks_total": collection.count(),
+    }
+
+
+def open_index(
+    persist_dir: str,
+    collection_name: Optional[str] = None,
+    model_name: Optional[str] = None,
+):
+    """Open a built index for querying; nothing is embedded except the queries"""
+    from langchain_chroma import Chroma
+
+    manifest = load_manifest(persist_dir)
+    if manifest is None:
+        raise IndexNotBuiltError(
+            f"No index in {persist_dir}; run `python 8_RAG/build_index.py` first"
+        )
+
+    settings = manifest["settings"]
+    if collection_name and collection_name != settings["collection"]:
+        raise IndexNotBuiltError(f"{persist_dir} holds {settings['collection']!r}, not {collection_name!r}")
+    if model_name and model_name != settings["embedding_model"]:
+        raise IndexNotBuiltError(
+            f"{persist_dir} was embedded with {settings['embedding_model']}, not {model_name}"
+        )
+
+    return Chroma(
+        client=get_chroma_client(persist_dir),
+        collection_name=settings["collection"],
+        embedding_function=get_embeddings(settings["embedding_model"]),
+        create_collection_if_not_exists=False,
+    )
+
+
+def stored_vectors(vector_store, documents: Sequence[Document]) -> List[Optional[np.ndarray]]:
+    """The vector Chroma stored for each document, or None for documents it does not hold"""
+    ids = list({document.id for document in documents if document.id})
+    if not ids:
+        return [None] * len(documents)
+    stored = vector_store.get(ids=ids, include=["embeddings"])
+    by_id = {
+        id_: np.asarray(vector, dtype=np.float32)
+        for id_, vector in zip(stored["ids"], stored["embeddings"])
+    }
+    return [by_id.get(document.id) if document.id else None for document in documents]
+
+
+def document_vectors(
+    embeddings: Embeddings, documents: Sequence[Document], vector_store=None
+) -> np.ndarray:
+    """Matrix of document vectors, read from vector_store where it has them and embedded otherwise"""
+    if vector_store is not None:
+        vectors = stored_vectors(vector_store, documents)
+    else:
+        vectors = [None] * len(documents)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        computed = embeddings.embed_documents([documents[i].page_content for i in missing])
+        for i, vector in zip(missing, computed):
+            vectors[i] = np.asarray(vector, dtype=np.float32)
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack(vectors)
@@ -0,0 +1,52 @@
+import os
+import sys
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.answer_cache import SemanticAnswerCache
+
+
+def test_key_table_is_bounded_by_live_entries():
+    cache = SemanticAnswerCache(DeterministicFakeEmbedding(size=16), max_entries=8)
+    for i in range(100):
+        documents = [Document(page_content=f"chunk {i}")]
+        assert cache.lookup("opening hours?", documents) is None
+        cache.store("opening hours?", documents, f"answer {i}")
+
+    assert len(cache._key_ids) == len(cache._key_refs) == 8
+    assert cache.lookup("opening hours?", [Document(page_content="chunk 99")]) == "answer 99"
+    assert cache.lookup("opening hours?", [Document(page_content="chunk 0")]) is None
+    assert cache.stats()["evicted"] == 92
+
+
+def test_expired_entries_release_their_keys():
+    cache = SemanticAnswerCache(DeterministicFakeEmbedding(size=16), ttl=-1)
+    documents = [Document(page_content="chunk")]
+    cache.store("opening hours?", documents, "answer")
+    cache.store("membership price?", documents, "other answer")
+    assert [refs for _, refs in cache._key_refs.values()] == [2]
+
+    assert cache.lookup("opening hours?", documents) is None
+    assert cache._key_ids == {} and cache._key_refs == {}
+
+
+def test_hits_return_copies_that_add_messages_keeps_apart():
+    cache = SemanticAnswerCache(DeterministicFakeEmbedding(size=16))
+    chain = RunnableLambda(lambda inputs: AIMessage(content="9am to 5pm"))
+    cached_chain = cache.wrap(chain)
+    inputs = {"question": "opening hours?", "context": "the gym opens 9am to 5pm"}
+
+    messages = add_messages([], [HumanMessage(content="opening hours?", id="q1")])
+    for turn in range(3):
+        messages = add_messages(messages, [cached_chain.invoke(inputs)])
+        messages = add_messages(messages, [HumanMessage(content="and again?", id=f"q{turn + 2}")])
+
+    answers = [message for message in messages if isinstance(message, AIMessage)]
+    assert cache.stats()["hits"] == 2
+    assert len(answers) == 3 and len({message.id for message in answers}) == 3
+    assert cache.lookup(inputs["question"], inputs["context"]).id is None
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import sys
+import time
+from typing import TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+from langgraph.types import Command, interrupt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.approvals import ApprovalNotPendingError, ApprovalQueue, ApprovalService
+from common.bounded_memory import BoundedMemorySaver
+from common.compact_serde import BlobStore, CompactSerializer
+from common.sqlite_checkpointer import DeltaSqliteSaver
+
+
+class PostState(TypedDict):
+    post: str
+    rounds: int
+
+
+def write(state: PostState):
+    return {"post": f"post v{state['rounds']}", "rounds": state["rounds"] + 1}
+
+
+def review(state: PostState):
+    feedback = interrupt({"post": state["post"], "message": "feedback or done"})
+    return Command(goto=END if feedback == "done" else "write")
+
+
+def build(checkpointer):
+    graph = StateGraph(PostState)
+    graph.add_node("write", write)
+    graph.add_node("review", review)
+    graph.set_entry_point("write")
+    graph.add_edge("write", "review")
+    return graph.compile(checkpointer=checkpointer)
+
+
+def test_park_and_resume_in_memory():
+    async def scenario():
+        service = ApprovalService(build(BoundedMemorySaver()))
+        await service.start("t1", {"rounds": 0})
+        [approval] = service.pending()
+        assert approval.value["post"] == "post v0"
+
+        results = await asyncio.gather(
+            service.resume("t1", "more"), service.resume("t1", "more"), return_exceptions=True
+        )
+        assert sum(isinstance(result, ApprovalNotPendingError) for result in results) == 1
+        assert service.pending()[0].value["post"] == "post v1"
+
+        state = await service.resume("t1", "done")
+        assert state.next == () and state.values["rounds"] == 2
+        assert service.pending() == [] and service._thread_locks == {}
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_park_and_resume_across_workers_with_delta_sqlite(tmp_path, compact):
+    """A second worker with its own saver and queue connection resumes what the first parked"""
+    checkpoints = str(tmp_path / "checkpoint.sqlite")
+    approvals = str(tmp_path / "approvals.sqlite")
+
+    def saver():
+        serde = CompactSerializer(BlobStore(checkpoints)) if compact else None
+        return DeltaSqliteSaver.from_conn_string(checkpoints, serde=serde)
+
+    async def first_worker():
+        with saver() as checkpointer:
+            service = ApprovalService(build(checkpointer), ApprovalQueue(approvals))
+            for thread in range(3):
+                await service.start(f"t{thread}", {"rounds": 0})
+
+    async def second_worker():
+        with saver() as checkpointer:
+            service = ApprovalService(build(checkpointer), ApprovalQueue(approvals))
+            pending = service.pending()
+            assert [approval.thread_id for approval in pending] == ["t0", "t1", "t2"]
+            for approval in pending:
+                state = await service.resume(approval.thread_id, "done", approval.interrupt_id)
+                assert state.next == () and state.values == {"post": "post v0", "rounds": 1}
+            assert service.pending() == []
+
+    asyncio.run(first_worker())
+    asyncio.run(second_worker())
+
+
+def test_claim_is_a_lease_that_survives_a_crashed_worker():
+    async def scenario():
+        app = build(BoundedMemorySaver())
+        service = ApprovalService(app, ApprovalQueue(lease=0.05))
+        await service.start("t1", {"rounds": 0})
+
+        # A worker claims the approval and dies before resuming the run
+        service.queue.claim("t1")
+        assert service.pending() == [] and len(service.queue) == 1
+        with pytest.raises(ApprovalNotPendingError):
+            await service.resume("t1", "done")
+        time.sleep(0.1)
+        state = await service.resume("t1", "more")
+        assert state.values["rounds"] == 2 and service.pending()[0].value["post"] == "post v1"
+
+        # A worker resumes the run and dies before deleting the entry
+        service.queue.claim("t1")
+        await app.ainvoke(Command(resume="done"), service.config("t1"))
+        time.sleep(0.1)
+        with pytest.raises(ApprovalNotPendingError):
+            await service.resume("t1", "done")
+        assert len(service.queue) == 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_resume_releases_its_claim():
+    async def scenario():
+        service = ApprovalService(build(BoundedMemorySaver()))
+        await service.start("t1", {"rounds": 0})
+        ainvoke = service.app.ainvoke
+
+        async def failing_ainvoke(*args, **kwargs):
+            raise RuntimeError("worker lost its database connection")
+
+        service.app.ainvoke = failing_ainvoke
+        with pytest.raises(RuntimeError):
+            await service.resume("t1", "done")
+        service.app.ainvoke = ainvoke
+        [approval] = service.pending()
+        assert approval.claimed_by is None
+
+        state = await service.resume("t1", "done", approval.interrupt_id)
+        assert state.next == () and len(service.queue) == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,33 @@
+import asyncio
+import os
+import sys
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.async_driver import ConversationDriver
+
+
+class Chat(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+async def count_turns(state: Chat):
+    await asyncio.sleep(0.001)
+    return {"messages": [AIMessage(content=f"turn {len(state['messages']) // 2 + 1}")]}
+
+
+def test_turns_stay_ordered_and_locks_are_released():
+    graph = StateGraph(Chat)
+    graph.add_node("chatbot", count_turns)
+    graph.set_entry_point("chatbot")
+    graph.add_edge("chatbot", END)
+    driver = ConversationDriver(graph.compile(checkpointer=MemorySaver()))
+
+    conversations = {f"user-{i}": ["hi", "more", "bye"] for i in range(50)}
+    replies = asyncio.run(driver.run_conversations(conversations))
+    assert all(reply == ["turn 1", "turn 2", "turn 3"] for reply in replies.values())
+    assert driver._thread_locks == {}
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, StateGraph, add_messages
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.bounded_memory import BoundedMemorySaver
+from common.sqlite_checkpointer import DeltaSqliteSaver
+
+
+class Chat(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def build(checkpointer):
+    graph = StateGraph(Chat)
+    graph.add_node("echo", lambda state: {"messages": [AIMessage(content="ok")]})
+    graph.set_entry_point("echo")
+    graph.add_edge("echo", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def config(thread):
+    return {"configurable": {"thread_id": f"user-{thread}"}}
+
+
+class SlowSpill(DeltaSqliteSaver):
+    """Spill store whose writes take a while, like a busy disk"""
+
+    delay = 0.0
+
+    def put(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super().put(*args, **kwargs)
+
+
+def test_concurrent_threads_survive_eviction(tmp_path):
+    with DeltaSqliteSaver.from_conn_string(str(tmp_path / "spill.sqlite")) as spill:
+        saver = BoundedMemorySaver(max_checkpoints=2, max_threads=4, spill=spill)
+        app = build(saver)
+
+        def chat(thread):
+            for turn in range(3):
+                app.invoke({"messages": [("user", f"q{turn}")]}, config(thread))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(chat, range(32)))
+
+        for thread in range(32):
+            assert len(app.get_state(config(thread)).values["messages"]) == 6
+        stats = saver.stats()
+        assert stats["threads"] <= 4 and stats["evictions"] > 0 and stats["reloads"] > 0
+        assert not saver._spilling and not saver._pins
+
+
+def test_resident_threads_do_not_wait_on_spill_io(tmp_path):
+    with SlowSpill.from_conn_string(str(tmp_path / "spill.sqlite")) as spill:
+        saver = BoundedMemorySaver(max_threads=2, spill=spill)
+        app = build(saver)
+        app.invoke({"messages": [("user", "hi")]}, config(0))
+        app.invoke({"messages": [("user", "hi")]}, config(1))
+
+        spill.delay = 0.5
+        # user-2 evicts user-0 and spills it while user-1 is read
+        writer = threading.Thread(target=app.invoke, args=({"messages": [("user", "hi")]}, config(2)))
+        writer.start()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        assert saver.get_tuple(config(1)) is not None
+        assert time.perf_counter() - start < 0.1
+        writer.join()
+
+        spill.delay = 0.0
+        assert len(app.get_state(config(0)).values["messages"]) == 2
+
+
+def test_async_spill_io_runs_off_the_event_loop(tmp_path):
+    with SlowSpill.from_conn_string(str(tmp_path / "spill.sqlite")) as spill:
+        saver = BoundedMemorySaver(max_threads=1, spill=spill)
+        app = build(saver)
+
+        async def scenario():
+            await app.ainvoke({"messages": [("user", "hi")]}, config(0))
+            spill.delay = 0.3
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await app.ainvoke({"messages": [("user", "hi")]}, config(1))
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(scenario()) >= 10
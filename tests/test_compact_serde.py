@@ -0,0 +1,29 @@
+import os
+import sqlite3
+import sys
+import threading
+
+from langchain_core.messages import AIMessage
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.compact_serde import DEDUP_MIN_LENGTH, BlobStore, CompactSerializer
+
+
+def test_integers_wider_than_64_bits_round_trip():
+    serde = CompactSerializer()
+    value = {"ids": [2**64, -(2**63) - 1, 2**200, 2**64 - 1, -(2**63)], "message": AIMessage(content="ok", id="1")}
+    assert serde.loads_typed(serde.dumps_typed(value)) == value
+
+
+def test_blob_store_waits_for_other_writers(tmp_path):
+    path = str(tmp_path / "checkpoint.sqlite")
+    blobs = BlobStore(path)
+    assert blobs._conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+    writer = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.3, writer.execute, args=("COMMIT",)).start()
+
+    text = "x" * DEDUP_MIN_LENGTH
+    blobs.put_many({BlobStore.key(text): text})
+    assert len(blobs) == 1
@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.embedding_cache import CachedEmbeddings
+
+
+def test_persisted_vectors_are_reused_only_by_the_same_model_and_dimension(tmp_path):
+    path = str(tmp_path / "embeddings")
+    texts = ["opening hours", "membership price"]
+    writer = CachedEmbeddings(DeterministicFakeEmbedding(size=8), persist_path=path, model_id="model-a")
+    expected = writer.embed_documents(texts)
+    writer.save()
+
+    same = CachedEmbeddings(DeterministicFakeEmbedding(size=8), persist_path=path, model_id="model-a")
+    assert same.embed_documents(texts) == expected and same.stats()["hits"] == 2
+
+    other_model = CachedEmbeddings(DeterministicFakeEmbedding(size=8), persist_path=path, model_id="model-b")
+    assert other_model.stats()["entries"] == 0
+
+    # Same id, but the model behind it now returns a different dimension
+    resized = CachedEmbeddings(DeterministicFakeEmbedding(size=16), persist_path=path, model_id="model-a")
+    assert resized.stats()["entries"] == 2
+    assert len(resized.embed_query("new question")) == 16
+    assert all(len(vector) == 16 for vector in resized.embed_documents(texts))
+    resized.save()
+    with open(f"{path}.keys.json") as f:
+        assert json.load(f)["dimension"] == 16
+
+    # Key files from before the header are ignored
+    with open(f"{path}.keys.json", "w") as f:
+        json.dump(["stale"] * 3, f)
+    legacy = CachedEmbeddings(DeterministicFakeEmbedding(size=16), persist_path=path, model_id="model-a")
+    assert legacy.stats()["entries"] == 0
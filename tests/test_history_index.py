@@ -0,0 +1,21 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.history_index import HistoryIndex
+
+
+def test_extend_numbers_entries_in_order_and_commits_once(tmp_path):
+    history = HistoryIndex(str(tmp_path / "history.sqlite"))
+    history.append("a0", "user", "t1")
+    history.extend([("a1", "assistant"), ("a2", "user"), ("a3", "assistant")], "t1")
+    history.extend([("b1", "user")], "t2")
+    history.extend([], "t2")
+    assert history.recent_ids(3, "t1") == ["a3", "a2", "a1"]
+    assert history.count("t2") == 1
+
+    statements = []
+    history._conn.set_trace_callback(statements.append)
+    history.extend([(f"c{i}", "user") for i in range(50)], "t1")
+    assert sum(statement.startswith("COMMIT") for statement in statements) == 1
+    assert history.trim(keep=2, thread_id="t1")[-1] == "c47"
@@ -0,0 +1,31 @@
+import os
+import sys
+
+from langchain_core.documents import Document
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.hybrid_retriever import HybridRetriever
+from test_vector_index import store
+
+TEXTS = [f"trainer {name} teaches {activity}" for name in ["neha", "marcus", "arjun"] for activity in ["yoga", "spin"]]
+
+
+def test_mmr_uses_stored_vectors():
+    vector_store, embeddings = store(TEXTS)
+    retriever = HybridRetriever.from_vector_store(vector_store, k=2, fetch_k=6)
+    embeddings.embedded = 0
+
+    results = retriever.invoke("trainer neha yoga")
+    assert len(results) == 2 and embeddings.embedded == 0
+
+
+def test_documents_without_ids_are_fused_once():
+    vector_store, _ = store(TEXTS)
+    documents = [Document(page_content=text) for text in TEXTS]
+    retriever = HybridRetriever.from_documents(documents, vector_store, k=6, fetch_k=6, use_mmr=False)
+    assert not retriever.key_by_id
+
+    results = retriever.invoke("trainer neha yoga")
+    contents = [document.page_content for document in results]
+    assert len(contents) == len(set(contents)) == 6
+    assert all(document.id for document in results)
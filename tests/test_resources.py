@@ -0,0 +1,27 @@
+import os
+import sys
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import resources
+
+
+def test_persist_paths_share_one_model(tmp_path, monkeypatch):
+    loaded = []
+
+    @resources.lazy_resource
+    def fake_model(model_name: str = resources.DEFAULT_EMBEDDING_MODEL):
+        loaded.append(model_name)
+        return DeterministicFakeEmbedding(size=8)
+
+    monkeypatch.setattr(resources, "get_embedding_model", fake_model)
+    resources.get_embeddings.cache_clear()
+    try:
+        first = resources.get_embeddings(persist_path=str(tmp_path / "a"))
+        second = resources.get_embeddings(persist_path=str(tmp_path / "b"))
+        assert first is not second and first.embeddings is second.embeddings
+        assert resources.get_embeddings() is resources.get_embeddings(resources.DEFAULT_EMBEDDING_MODEL)
+        assert loaded == [resources.DEFAULT_EMBEDDING_MODEL]
+    finally:
+        resources.get_embeddings.cache_clear()
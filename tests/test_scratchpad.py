@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+from langchain_core.agents import AgentAction, AgentActionMessageLog
+from langchain_core.messages import AIMessage
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "5_react_agent"))
+from scratchpad import (
+    KEEP_LAST_TURNS,
+    SCRATCHPAD_TOKEN_BUDGET,
+    compact_steps,
+    scratchpad_tokens,
+)
+
+
+def steps(count: int, observation_chars: int):
+    return [
+        (AgentAction(tool="search", tool_input=f"q{i}", log=""), f"{i}:" + "x" * observation_chars)
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("count", [4, 10, 50, 200])
+@pytest.mark.parametrize("observation_chars", [50, 400, 2000])
+def test_compacted_scratchpad_fits_budget(count, observation_chars):
+    original = steps(count, observation_chars)
+    compacted, saved = compact_steps(original)
+
+    recent = original[-KEEP_LAST_TURNS:]
+    assert compacted[-KEEP_LAST_TURNS:] == recent
+    if scratchpad_tokens(recent) <= SCRATCHPAD_TOKEN_BUDGET:
+        assert scratchpad_tokens(compacted) <= SCRATCHPAD_TOKEN_BUDGET
+    assert saved == scratchpad_tokens(original) - scratchpad_tokens(compacted)
+
+
+def test_truncated_steps_keep_shrinking_on_later_rounds():
+    # Once truncation has nothing left to cut, the oldest steps must still be dropped
+    history = []
+    for _ in range(100):
+        history += steps(1, 800)
+        history, _ = compact_steps(history)
+        assert scratchpad_tokens(history) <= SCRATCHPAD_TOKEN_BUDGET
+
+
+def test_under_budget_is_untouched():
+    original = steps(5, 40)
+    assert compact_steps(original) == (original, 0)
+
+
+def parallel_turn(turn: int, calls_per_turn: int, observation_chars: int):
+    """Steps of one turn as a tool calling agent records them: a shared message_log"""
+    calls = [
+        {"name": "search", "args": {"query": f"q{turn}.{i}"}, "id": f"call_{turn}_{i}"}
+        for i in range(calls_per_turn)
+    ]
+    message_log = [AIMessage(content="", tool_calls=calls)]
+    return [
+        (
+            AgentActionMessageLog(tool="search", tool_input=call["args"], log="", message_log=message_log),
+            f"{call['id']}:" + "x" * observation_chars,
+        )
+        for call in calls
+    ]
+
+
+def unanswered_tool_calls(history) -> list:
+    """Tool calls of the kept AIMessages whose observation was dropped"""
+    answered = {observation.split(":", 1)[0] for _, observation in history}
+    return [
+        call["id"]
+        for action, _ in history
+        for call in action.message_log[-1].tool_calls
+        if call["id"] not in answered
+    ]
+
+
+@pytest.mark.parametrize("calls_per_turn", [2, 3, 5])
+def test_parallel_tool_call_batches_are_kept_or_dropped_whole(calls_per_turn):
+    history = []
+    for turn in range(40):
+        latest = parallel_turn(turn, calls_per_turn, 700)
+        history, _ = compact_steps(history + latest)
+        assert unanswered_tool_calls(history) == []
+        assert len(history) % calls_per_turn == 0
+        assert history[-calls_per_turn:] == latest
+
+    assert len(history) >= KEEP_LAST_TURNS * calls_per_turn
+    assert history[0][0].message_log != history[-1][0].message_log
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import sys
+from typing import Any
+
+from langchain_core.tools import BaseTool
+from pydantic import PrivateAttr
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.search_cache import SearchCache, cache_namespace, cached_search_tool
+
+
+class FakeSearch(BaseTool):
+    name: str = "fake_search"
+    description: str = "Returns max_results fake hits"
+    max_results: int = 5
+    search_depth: str = "advanced"
+    client: Any = None
+    _calls: int = PrivateAttr(default=0)
+
+    def _run(self, query: str) -> list:
+        self._calls += 1
+        return [{"url": f"https://example.com/{i}", "content": query} for i in range(self.max_results)]
+
+
+def test_differently_configured_tools_do_not_share_results(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    short, long = FakeSearch(max_results=2, client=object()), FakeSearch(max_results=5, client=object())
+    assert cache_namespace(short) != cache_namespace(long)
+    assert cache_namespace(short) == cache_namespace(FakeSearch(max_results=2))
+    assert cache_namespace(FakeSearch(search_depth="basic")) != cache_namespace(FakeSearch())
+
+    assert len(cached_search_tool(short, cache).invoke("gym hours")) == 2
+    assert len(cached_search_tool(long, cache).invoke("gym hours")) == 5
+    assert len(cached_search_tool(short, cache).invoke("Gym  Hours")) == 2
+    assert (short._calls, long._calls) == (1, 1)
+
+
+def test_async_lookups_hit_the_cache(tmp_path):
+    tool = FakeSearch()
+    cached = cached_search_tool(tool, SearchCache(str(tmp_path / "cache.sqlite")))
+
+    async def scenario():
+        first = await cached.ainvoke("gym hours")
+        return first, await cached.ainvoke("gym hours")
+
+    first, second = asyncio.run(scenario())
+    assert first == second and tool._calls == 1
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph, add_messages
+from langgraph.types import Command, interrupt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.compact_serde import BlobStore, CompactSerializer
+from common.sqlite_checkpointer import DeltaSqliteSaver, MissingBlobError
+
+
+class State(TypedDict):
+    log: list
+
+
+def hello(state: State):
+    return {"log": state["log"] + ["h"]}
+
+
+def ask(state: State):
+    answer = interrupt("continue?")
+    return {"log": state["log"] + [f"got {answer}"]}
+
+
+def build(checkpointer):
+    graph = StateGraph(State)
+    graph.add_node("hello", hello)
+    graph.add_node("ask", ask)
+    graph.set_entry_point("hello")
+    graph.add_edge("hello", "ask")
+    graph.add_edge("ask", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def round_trip(checkpointer):
+    app = build(checkpointer)
+    config = {"configurable": {"thread_id": "1"}}
+    app.invoke({"log": []}, config)
+    state = app.get_state(config)
+    app.invoke(Command(resume="yes"), config)
+    return state.next, app.get_state(config).values["log"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_interrupt_resume_matches_memory_saver(tmp_path, compact):
+    path = str(tmp_path / "checkpoint.sqlite")
+    serde = CompactSerializer(BlobStore(path)) if compact else None
+    with DeltaSqliteSaver.from_conn_string(path, serde=serde) as saver:
+        assert round_trip(saver) == round_trip(MemorySaver()) == (("ask",), ["h", "got yes"])
+
+
+def test_interrupt_survives_reopen(tmp_path):
+    path = str(tmp_path / "checkpoint.sqlite")
+    config = {"configurable": {"thread_id": "1"}}
+    with DeltaSqliteSaver.from_conn_string(path) as saver:
+        build(saver).invoke({"log": []}, config)
+    with DeltaSqliteSaver.from_conn_string(path) as saver:
+        app = build(saver)
+        assert app.get_state(config).next == ("ask",)
+        app.invoke(Command(resume="yes"), config)
+        assert app.get_state(config).values["log"] == ["h", "got yes"]
+
+
+class Chat(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def test_missing_delta_base_raises(tmp_path):
+    path = str(tmp_path / "checkpoint.sqlite")
+    config = {"configurable": {"thread_id": "1"}}
+    graph = StateGraph(Chat)
+    graph.add_node("echo", lambda state: {"messages": [("ai", "ok")]})
+    graph.set_entry_point("echo")
+    graph.add_edge("echo", END)
+
+    with DeltaSqliteSaver.from_conn_string(path) as saver:
+        app = graph.compile(checkpointer=saver)
+        for turn in range(3):
+            app.invoke({"messages": [("user", f"q{turn}")]}, config)
+
+    conn = sqlite3.connect(path)
+    conn.execute("DELETE FROM blobs WHERE channel = 'messages' AND kind = 'snapshot'")
+    conn.commit()
+    conn.close()
+
+    with DeltaSqliteSaver.from_conn_string(path) as saver:
+        with pytest.raises(MissingBlobError):
+            graph.compile(checkpointer=saver).get_state(config)
+
+
+def test_delta_cache_is_capped_by_bytes(tmp_path):
+    with DeltaSqliteSaver.from_conn_string(str(tmp_path / "checkpoint.sqlite"), cache_bytes=4096) as saver:
+        graph = StateGraph(Chat)
+        graph.add_node("echo", lambda state: {"messages": [("ai", "x" * 200)]})
+        graph.set_entry_point("echo")
+        graph.add_edge("echo", END)
+        app = graph.compile(checkpointer=saver)
+        for thread in range(50):
+            app.invoke({"messages": [("user", "hi")]}, {"configurable": {"thread_id": str(thread)}})
+        assert 0 < saver._latest_bytes <= 4096
+        assert saver._latest_bytes == sum(entry[3] for entry in saver._latest.values())
+
+
+def chat_graph(saver):
+    graph = StateGraph(Chat)
+    graph.add_node("echo", lambda state: {"messages": [("ai", "ok")]})
+    graph.set_entry_point("echo")
+    graph.add_edge("echo", END)
+    return graph.compile(checkpointer=saver)
+
+
+def test_failed_commit_is_not_a_delta_base(tmp_path):
+    def put(saver, number, messages):
+        checkpoint = empty_checkpoint()
+        checkpoint["id"] = str(uuid6(clock_seq=number))
+        checkpoint["channel_values"] = {"messages": messages}
+        checkpoint["channel_versions"] = {"messages": number}
+        config = {"configurable": {"thread_id": "1", "checkpoint_ns": ""}}
+        return saver.put(config, checkpoint, {}, {"messages": number})
+
+    with DeltaSqliteSaver.from_conn_string(str(tmp_path / "checkpoint.sqlite")) as saver:
+        put(saver, 1, ["a"])
+
+        submit = saver.writer.submit
+        failed = Future()
+        failed.set_exception(sqlite3.OperationalError("disk I/O error"))
+        saver.writer.submit = lambda statements: failed
+        with pytest.raises(sqlite3.OperationalError):
+            put(saver, 2, ["a", "b"])
+        saver.writer.submit = submit
+
+        # Would be a delta on version 2, which was never written
+        latest = put(saver, 3, ["a", "b", "c"])
+        assert saver.get_tuple(latest).checkpoint["channel_values"]["messages"] == ["a", "b", "c"]
+
+
+def test_async_put_serializes_off_the_event_loop(tmp_path):
+    loop_threads = set()
+
+    class RecordingSaver(DeltaSqliteSaver):
+        def _put_statements(self, *args):
+            loop_threads.add(threading.get_ident())
+            return super()._put_statements(*args)
+
+    async def scenario():
+        with RecordingSaver.from_conn_string(str(tmp_path / "checkpoint.sqlite")) as saver:
+            app = chat_graph(saver)
+            config = {"configurable": {"thread_id": "1"}}
+            for turn in range(3):
+                await app.ainvoke({"messages": [("user", f"q{turn}")]}, config)
+            return threading.get_ident(), len((await app.aget_state(config)).values["messages"])
+
+    loop_thread, messages = asyncio.run(scenario())
+    assert messages == 6 and loop_threads and loop_thread not in loop_threads
@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+import time
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.topic_classifier import OFF_TOPIC, TopicClassifier
+
+# Axes: gym hours, gym prices, the world outside the gym, unrelated noise
+VECTORS = {
+    "When do you open?": [1, 0, 0, 0],
+    "What time do you close?": [0.9, 0.1, 0, 0],
+    "How much is a membership?": [0, 1, 0, 0],
+    "Is there a student discount?": [0.1, 0.9, 0, 0],
+    "What is the capital of France?": [0, 0, 1, 0],
+    "Write me a poem.": [0, 0, 0.9, 0.1],
+    "Are you open on Sundays?": [0.95, 0.05, 0.1, 0],
+    "Who won the election?": [0, 0.1, 1, 0],
+    "Is the gym near the election office?": [0.6, 0, 0.6, 0],
+    "Qwerty zxcv?": [0, 0, 0, 1],
+}
+TOPICS = {
+    "hours": ["When do you open?", "What time do you close?"],
+    "membership": ["How much is a membership?", "Is there a student discount?"],
+    OFF_TOPIC: ["What is the capital of France?", "Write me a poem."],
+}
+
+
+class StubEmbeddings(Embeddings):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.document_calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.document_calls += 1
+        time.sleep(self.delay)
+        return [VECTORS[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return VECTORS[text]
+
+
+def classifier(embeddings=None):
+    asked = []
+
+    def fallback(question):
+        asked.append(question)
+        return "LLM"
+
+    return TopicClassifier(embeddings or StubEmbeddings(), fallback, topics=TOPICS), asked
+
+
+@pytest.mark.parametrize(
+    "question, expected, asks_llm",
+    [
+        ("Are you open on Sundays?", "Yes", False),
+        ("Who won the election?", "No", False),
+        ("Is the gym near the election office?", "LLM", True),  # Inside the margin
+        ("Qwerty zxcv?", "LLM", True),  # Below min_similarity
+    ],
+)
+def test_confident_questions_stay_local_and_ambiguous_ones_go_to_the_llm(question, expected, asks_llm):
+    topic_classifier, asked = classifier()
+    assert topic_classifier.classify(question) == expected
+    assert asked == ([question] if asks_llm else [])
+
+    assert topic_classifier.classify(question.upper()) == expected
+    assert topic_classifier.stats()["cache_hits"] == 1 and len(asked) == int(asks_llm)
+
+
+def test_concurrent_first_questions_build_the_centroids_once():
+    embeddings = StubEmbeddings(delay=0.05)
+    topic_classifier, _ = classifier(embeddings)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(topic_classifier.classify_locally("Are you open on Sundays?")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["Yes"] * 8
+    assert embeddings.document_calls == len(TOPICS)
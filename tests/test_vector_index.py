@@ -0,0 +1,62 @@
+import os
+import sys
+import uuid
+
+import chromadb
+import numpy as np
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.relevance_filter import SimilarityPrefilter
+from common.vector_index import document_vectors, stored_vectors
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def store(texts):
+    embeddings = CountingEmbeddings(size=16)
+    vector_store = Chroma(
+        client=chromadb.EphemeralClient(),
+        collection_name=f"test-{uuid.uuid4().hex}",
+        embedding_function=embeddings,
+    )
+    vector_store.add_texts(texts, ids=[f"chunk:{i}" for i in range(len(texts))])
+    embeddings.embedded = 0
+    return vector_store, embeddings
+
+
+def test_retrieved_documents_use_stored_vectors():
+    vector_store, embeddings = store(["monthly fee is 800", "open from 6am", "yoga on sundays"])
+    documents = vector_store.similarity_search("fee", k=3)
+
+    vectors = document_vectors(embeddings, documents, vector_store)
+    expected = embeddings.embed_documents([document.page_content for document in documents])
+    assert np.allclose(vectors, expected, atol=1e-6)
+    assert embeddings.embedded == len(documents)  # Only the reference call above
+
+
+def test_documents_not_in_the_store_are_embedded():
+    vector_store, embeddings = store(["monthly fee is 800"])
+    documents = [Document(id="chunk:0", page_content="monthly fee is 800"), Document(page_content="new text")]
+
+    assert [vector is None for vector in stored_vectors(vector_store, documents)] == [False, True]
+    assert document_vectors(embeddings, documents, vector_store).shape == (2, 16)
+    assert embeddings.embedded == 1
+
+
+def test_prefilter_embeds_only_the_question():
+    vector_store, embeddings = store(["monthly fee is 800", "open from 6am", "yoga on sundays"])
+    documents = vector_store.similarity_search("fee", k=3)
+    prefilter = SimilarityPrefilter(embeddings, vector_store=vector_store)
+
+    decisions = prefilter.classify("fee", documents)
+    assert len(decisions) == 3 and embeddings.embedded == 0
+    assert np.allclose(prefilter.scores("fee", documents), SimilarityPrefilter(embeddings).scores("fee", documents))